@@ -5,12 +5,17 @@ Mode batch processing dengan window size 500x500
 Menggunakan list.txt untuk input email dan save ke valid.txt & invalid.txt
 """
 
+import atexit
 import time
+import random
 import re
 import subprocess
 import logging
 import threading
-from queue import Queue
+import itertools
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
 import undetected_chromedriver as uc
 import tempfile
 try:
@@ -33,7 +38,7 @@ class BrowserDetectedException(WebDriverException):
     pass
 
 # Helper detection strings that indicate browser was detected / blocked
-BOT_DETECTION_MARKERS = [
+BOT_DETECTION_MARKERS = (
     'access denied', 'unusual traffic', 'have detected', 'captcha', 'recaptcha', 'blocked',
     'error 403', 'error 429', 'corrupt', 'corrupted', 'connection reset',
     'an unknown error occurred', 'unknown error occurred', 'please try again',
@@ -41,7 +46,78 @@ BOT_DETECTION_MARKERS = [
     'something went wrong', 'temporary issue', 'service unavailable', 'try again later',
     'browser not supported', 'javascript required', 'cookies required',
     'request blocked', 'access restricted', 'verification required'
-]
+)
+
+# Explicit messages that mean the account doesn't exist
+INVALID_MARKERS = (
+    'account not found', "we couldn't find", "couldn't find", 'no account',
+    'not registered', 'no user found', 'email not found', 'invalid email'
+)
+
+# "Unknown error" markers are handled separately from the other detection markers
+# because they only trigger a browser restart when persistent (see validate_email)
+_UNKNOWN_ERROR_MARKERS = frozenset({'an unknown error occurred', 'unknown error occurred', 'please try again'})
+
+
+def _marker_pattern(markers, flags=0):
+    """Compile a list of literal markers into one alternation so a page is scanned once, not once per marker."""
+    return re.compile('|'.join(re.escape(m) for m in markers), flags)
+
+
+_INVALID_MARKER_RE = _marker_pattern(INVALID_MARKERS)
+_DETECTION_MARKER_RE = _marker_pattern(m for m in BOT_DETECTION_MARKERS if m not in _UNKNOWN_ERROR_MARKERS)
+# All markers, for matching raw (mixed-case) WebDriver error messages without lowering them
+_ANY_DETECTION_MARKER_RE = _marker_pattern(BOT_DETECTION_MARKERS, re.IGNORECASE)
+_UNKNOWN_ERROR_RE = re.compile(r'(?:an )?unknown error occurred')
+
+# Phone-ending extraction patterns used for every valid email
+_ENDING_RE = re.compile(r'ending in\s*([•\*x\s\d]+)', re.I)
+_DIGIT_GROUP_RE = re.compile(r'(\d{2,4})')
+# Cheap shape check (local@domain.tld, no spaces); anything failing it can't have an account
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s.]+\.[^@\s]+$')
+# Chrome major version in a user-agent string (headless UA masking)
+_CHROME_MAJOR_RE = re.compile(r'Chrome/(\d+)')
+
+# Set an input's value in one round-trip. Uses the native value setter so React-controlled
+# inputs pick up the change, then fires the events the form listens to.
+_SET_INPUT_VALUE_JS = (
+    "const el = arguments[0], val = arguments[1];"
+    "const setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, 'value').set;"
+    "setter.call(el, val);"
+    "el.dispatchEvent(new Event('input', {bubbles: true}));"
+    "el.dispatchEvent(new Event('change', {bubbles: true}));"
+    "return el.value;"
+)
+
+# Lightweight page status (URL, password field, lowercased visible text) in one round-trip.
+# Optional arguments[0] caps the text length (default 4000 for polling; 0 = full text).
+_PAGE_STATUS_JS = (
+    "const limit = arguments.length ? arguments[0] : 4000;"
+    "const pw = document.querySelector(\"input[type='password'], input[name='password']\");"
+    "const text = document.body ? document.body.innerText : '';"
+    "return {url: location.href, hasPw: !!pw, body: (limit ? text.slice(0, limit) : text).toLowerCase()};"
+)
+
+# Password-step check alone: one querySelector, no innerText serialization (cheap enough to poll)
+_PASSWORD_PRESENT_JS = "return !!document.querySelector(\"input[type='password'], input[name='password']\");"
+
+# Click the first link/button whose text mentions "forgot"; returns whether one was found
+_CLICK_FORGOT_JS = (
+    "const el = Array.from(document.querySelectorAll('a, button')).find(e => /forgot/i.test(e.textContent));"
+    "if (!el) return false;"
+    "el.click();"
+    "return true;"
+)
+
+
+def _verification_status(driver):
+    """WebDriverWait predicate: page status once the masked phone text ('ending in/with') is shown."""
+    status = driver.execute_script(_PAGE_STATUS_JS) or {}
+    body = status.get('body') or ''
+    if 'ending in' in body or 'ending with' in body:
+        return status
+    return False
+
 
 # Setup logging
 logging.basicConfig(
@@ -51,44 +127,43 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def classify_page(final_url: str, page_source: str):
+def classify_page(final_url: str, page_source: str, lowered: bool = False):
     """Classify the page into valid/invalid/detection.
 
+    page_source is the page's visible text as returned by _PAGE_STATUS_JS (not HTML); the password
+    field itself is detected from the probe's hasPw, so only the URL and text markers are checked here.
+    Pass lowered=True when it is already lowercase (the probe lowercases in the browser).
+
     Returns: (is_valid: bool, is_invalid: bool, is_detection: bool, reason: str)
     """
     fu = (final_url or '').lower()
-    ps = (page_source or '').lower()
 
     # Check for password page (valid account) - HIGHEST PRIORITY for VALID
     # Logic: If URL contains /password, it is VALID.
     if '/password' in fu:
         return True, False, False, 'url_contains_password'
 
-    if 'input type=\'password\'' in ps or 'input type="password"' in ps or 'name="password"' in ps:
-        return True, False, False, 'password_field_found'
+    # Only lower the page text once the cheap URL test didn't settle it (and only if needed)
+    ps = page_source or ''
+    if not lowered:
+        ps = ps.lower()
 
     # Common invalid markers - Check these BEFORE detection markers
     # These are explicit messages that mean the account doesn't exist
-    invalid_markers = [
-        'account not found', "we couldn't find", "couldn't find", 'no account', 
-        'not registered', 'no user found', 'email not found', 'invalid email'
-    ]
-    for im in invalid_markers:
-        if im in ps:
-            return False, True, False, f"invalid_marker:{im}"
+    match = _INVALID_MARKER_RE.search(ps)
+    if match:
+        return False, True, False, f"invalid_marker:{match.group(0)}"
 
     # Detection markers - BUT exclude "an unknown error occurred" and "please try again" here
     # because those are handled separately and trigger browser restart
-    detection_markers_filtered = [m for m in BOT_DETECTION_MARKERS 
-                                   if m not in ['an unknown error occurred', 'unknown error occurred', 'please try again']]
-    
-    for m in detection_markers_filtered:
-        if m in fu or m in ps:
-            logger.warning(f"🤖 Bot detection marker found: '{m}' - Browser needs restart!")
-            return False, False, True, f"detected_marker:{m}"
+    match = _DETECTION_MARKER_RE.search(fu) or _DETECTION_MARKER_RE.search(ps)
+    if match:
+        m = match.group(0)
+        logger.warning(f"🤖 Bot detection marker found: '{m}' - Browser needs restart!")
+        return False, False, True, f"detected_marker:{m}"
 
     # Check for "unknown error" - this should trigger detection/restart
-    if 'an unknown error occurred' in ps or 'unknown error occurred' in ps:
+    if _UNKNOWN_ERROR_RE.search(ps):
         logger.warning(f"🤖 Unknown error detected - Browser needs restart!")
         return False, False, True, "detected_marker:unknown_error"
 
@@ -98,6 +173,114 @@ def classify_page(final_url: str, page_source: str):
     return False, True, False, 'fallback_invalid'
 
 
+class _ResultWriter:
+    """Appends result lines to their files from one background flusher thread.
+
+    Workers only queue (filename, line) pairs. The flusher writes each file's pending lines with
+    one os.write() as soon as FLUSH_BATCH lines are waiting, or FLUSH_INTERVAL seconds after the
+    first one, so the GUI still sees results almost immediately. Each file is opened once
+    (O_APPEND) and its descriptor kept for the whole run; os.write releases the GIL and skips
+    the buffered-file layer.
+    """
+
+    FLUSH_INTERVAL = 0.1
+    FLUSH_BATCH = 32
+
+    def __init__(self):
+        self._fds = {}
+        self._pending = deque()
+        self._cv = threading.Condition()
+        # Serializes flushes (flusher thread vs. explicit flush()/close())
+        self._io_lock = threading.Lock()
+        self._thread = None
+
+    def write(self, filename, message):
+        with self._cv:
+            self._pending.append((filename, message))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='ap_result_writer', daemon=True)
+                self._thread.start()
+            # Wake the flusher for the first line (starts the interval) and when a batch is full
+            if len(self._pending) == 1 or len(self._pending) >= self.FLUSH_BATCH:
+                self._cv.notify()
+
+    def _run(self):
+        while True:
+            with self._cv:
+                while not self._pending:
+                    self._cv.wait()
+                if len(self._pending) < self.FLUSH_BATCH:
+                    self._cv.wait(self.FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        """Write out everything queued so far."""
+        with self._io_lock:
+            with self._cv:
+                batch, self._pending = self._pending, deque()
+            if not batch:
+                return
+            grouped = {}
+            for filename, message in batch:
+                grouped.setdefault(filename, []).append(message)
+            for filename, lines in grouped.items():
+                try:
+                    fd = self._fds.get(filename)
+                    if fd is None:
+                        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                        self._fds[filename] = fd
+                    data = memoryview(''.join(lines).encode('utf-8'))
+                    while data:
+                        data = data[os.write(fd, data):]
+                except Exception as e:
+                    logger.error(f"❌ Error saving to file {filename}: {e}")
+
+    def close(self):
+        self.flush()
+        with self._io_lock:
+            for fd in self._fds.values():
+                try:
+                    os.close(fd)
+                except Exception:
+                    pass
+            self._fds.clear()
+
+
+_result_writer = _ResultWriter()
+atexit.register(_result_writer.close)
+
+
+def _mask_phone_ending(phone_ending):
+    """Format a masked phone ending like '••• 05' as '***05' (first digit run).
+
+    The strings are a handful of characters, so a plain scan is cheaper than a regex search.
+    Returns phone_ending unchanged when it has no digits.
+    """
+    digits = ''
+    for c in phone_ending:
+        if c.isdecimal():
+            digits += c
+        elif digits:
+            break
+    return f"***{digits}" if digits else phone_ending
+
+
+# (epoch second, formatted timestamp) of the last _cached_ts() call; replaced as a whole tuple,
+# so concurrent workers never see a half-updated pair
+_ts_cache = (0, '')
+
+
+def _cached_ts():
+    """Current local time as 'YYYY-mm-dd HH:MM:SS', formatted at most once per second."""
+    global _ts_cache
+    now = int(time.time())
+    sec, text = _ts_cache
+    if sec != now:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        _ts_cache = (now, text)
+    return text
+
+
 def save_email_result(email, status, url=None, phone_ending=None, verification_url=None, display=None):
     """Save email result to appropriate file"""
     try:
@@ -108,14 +291,7 @@ def save_email_result(email, status, url=None, phone_ending=None, verification_u
                 message = f"{display}\n"
             else:
                 if phone_ending:
-                    # Extract digits from phone_ending and format as ***{digits}
-                    dig = re.search(r"(\d{1,})", phone_ending or '')
-                    if dig:
-                        mask = f"***{dig.group(1)}"
-                    else:
-                        # fallback without digits
-                        mask = phone_ending
-                    message = f"✅ VALID - {email} |  {mask}\n"
+                    message = f"✅ VALID - {email} |  {_mask_phone_ending(phone_ending)}\n"
                 else:
                     message = f"✅ VALID - {email}\n"
         else:
@@ -123,14 +299,146 @@ def save_email_result(email, status, url=None, phone_ending=None, verification_u
             message = f"❌ INVALID - {email}\n"
             message += "---\n"
         
-        with open(filename, 'a', encoding='utf-8') as f:
-            f.write(message)
+        _result_writer.write(filename, message)
         logger.debug(f"💾 Saved to {filename}: {email}")
         
     except Exception as e:
         logger.error(f"❌ Error saving to file: {e}")
 
 
+# Resources the validator never needs; blocked via CDP so each portal load only fetches
+# the HTML/JS it works with. CSS is deliberately NOT blocked: without stylesheets hidden
+# error templates become visible and leak into innerText (false invalid/detection markers).
+_BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.ico', '*.svg',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm',
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*', '*analytics*',
+    '*connect.facebook.net*', '*facebook.com/tr*', '*segment.io*', '*cdn.segment.com*',
+]
+
+
+def _service_pid(driver):
+    """PID of a driver's chromedriver service process, or None."""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def _kill_process_tree(*pids, timeout=1.0):
+    """Stop one or more processes and all of their descendants (requires psutil).
+
+    Every process in the trees gets terminate() first and one shared wait of `timeout` seconds;
+    only the processes still alive after that are killed. timeout=0 kills everything straight away
+    without waiting (force stop). Returns how many of pids still existed.
+    """
+    procs = []
+    found = 0
+    for pid in pids:
+        try:
+            parent = psutil.Process(pid)
+        except psutil.Error:
+            continue
+        found += 1
+        try:
+            procs.extend(parent.children(recursive=True))
+        except psutil.Error:
+            pass
+        procs.append(parent)
+    if not procs:
+        return 0
+    if timeout <= 0:
+        for p in procs:
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        return found
+    for p in procs:
+        try:
+            p.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    for p in alive:
+        try:
+            p.kill()
+        except psutil.Error:
+            pass
+    if alive:
+        psutil.wait_procs(alive, timeout=timeout)
+    return found
+
+
+# uc patches (and without a path, downloads) a chromedriver on every uc.Chrome() call; do it once
+# per process instead and hand the same binary to every validator
+_driver_patch_lock = threading.Lock()
+_driver_patcher = None  # kept referenced so the patched binary stays put for the process lifetime
+_patched_driver_path = None  # '' once patching failed: uc then falls back to its own per-driver patching
+
+
+def _shared_driver_path():
+    """Path of the shared uc-patched chromedriver (patched on first call), or None if unavailable."""
+    global _driver_patcher, _patched_driver_path
+    if _patched_driver_path is None:
+        with _driver_patch_lock:
+            if _patched_driver_path is None:
+                # If we're running from a frozen EXE (PyInstaller), try to ensure a matching chromedriver is available
+                # This helps undetected-chromedriver to work properly when bundled as a singlefile EXE.
+                try:
+                    import chromedriver_autoinstaller
+                    chromedriver_autoinstaller.install()
+                    logger.debug("🔧 chromedriver_autoinstaller ensured a matching chromedriver")
+                except Exception as e:
+                    logger.debug(f"🔎 chromedriver_autoinstaller not available or failed: {e}")
+                try:
+                    from undetected_chromedriver.patcher import Patcher
+                    patcher = Patcher()
+                    patcher.auto()
+                    _driver_patcher = patcher
+                    _patched_driver_path = patcher.executable_path
+                    logger.debug(f"🔧 Patched chromedriver shared at {_patched_driver_path}")
+                except Exception as e:
+                    logger.debug(f"🔎 Could not pre-patch chromedriver, uc will patch per driver: {e}")
+                    _patched_driver_path = ''
+    return _patched_driver_path or None
+
+
+def _ram_profile_base_dir(min_free=512 * 1024 * 1024):
+    """/dev/shm when it is a writable tmpfs with room for a few profiles, else None (default tempdir).
+
+    Random profiles are created and deleted on every recycle; in RAM that costs no disk I/O.
+    Container /dev/shm is often only 64MB, which a Chrome profile outgrows, hence the free-space check.
+    """
+    base = '/dev/shm'
+    try:
+        if not (sys.platform.startswith('linux') and os.path.isdir(base) and os.access(base, os.W_OK)):
+            return None
+        st = os.statvfs(base)
+        return base if st.f_bavail * st.f_frsize >= min_free else None
+    except Exception:
+        return None
+
+
+# Where random profiles are created; fixed for the process lifetime, so checked once
+_PROFILE_BASE_DIR = _ram_profile_base_dir()
+
+
+# Temporary profile dirs of validators that have not been closed yet
+_live_profile_dirs = set()
+
+
+def _remove_live_profile_dirs():
+    """Remove profile dirs left behind by validators that were never closed (e.g. on Ctrl+C)."""
+    for profile_dir in list(_live_profile_dirs):
+        shutil.rmtree(profile_dir, ignore_errors=True)
+    _live_profile_dirs.clear()
+
+
+atexit.register(_remove_live_profile_dirs)
+
+
 class AfterPayBatchValidator:
     """AfterPay Email Batch Validator with 500x500 window"""
     
@@ -140,7 +448,13 @@ class AfterPayBatchValidator:
         self.random_profile = random_profile
         self.profile_dir = None
         self.window_position = window_position
-        self.create_driver()
+        try:
+            self.create_driver()
+        except Exception:
+            # A half-created validator is never returned to the caller, so release its
+            # browser process and temporary profile here instead of leaking them
+            self.close()
+            raise
     
     def create_driver(self):
         """Create Chrome driver with 500x500 window"""
@@ -172,6 +486,9 @@ class AfterPayBatchValidator:
             
             # Window size - Set to 500x500
             options.add_argument('--window-size=500,500')
+
+            # Return from driver.get at DOMContentLoaded; validate_email waits for the email input explicitly
+            options.page_load_strategy = 'eager'
             
             # Set window position if provided
             if self.window_position:
@@ -184,7 +501,8 @@ class AfterPayBatchValidator:
             # If requested, create a temporary user-data-dir (random Chrome profile)
             if self.random_profile:
                 try:
-                    self.profile_dir = tempfile.mkdtemp(prefix="ap_profile_")
+                    self.profile_dir = tempfile.mkdtemp(prefix="ap_profile_", dir=_PROFILE_BASE_DIR)
+                    _live_profile_dirs.add(self.profile_dir)
                     options.add_argument(f"--user-data-dir={self.profile_dir}")
                     logger.debug(f"🔐 Using random profile dir: {self.profile_dir}")
                 except Exception as e:
@@ -207,33 +525,21 @@ class AfterPayBatchValidator:
             if chrome_binary:
                 options.binary_location = chrome_binary
 
-            # If we're running from a frozen EXE (PyInstaller), try to ensure a matching chromedriver is available
-            # This helps undetected-chromedriver to work properly when bundled as a singlefile EXE.
-            try:
-                import chromedriver_autoinstaller
-                chromedriver_autoinstaller.install()
-                logger.debug("🔧 chromedriver_autoinstaller ensured a matching chromedriver")
-            except Exception as e:
-                logger.debug(f"🔎 chromedriver_autoinstaller not available or failed: {e}")
+            # One chromedriver, patched once per process and shared by every validator
+            driver_path = _shared_driver_path()
             
             # Create driver with fallback methods
             try:
                 # Method 1: Normal undetected chrome
                 # Use uc to create the browser; explicitly handle common frozen EXE pitfalls
-                self.driver = uc.Chrome(options=options, version_main=None)
+                self.driver = uc.Chrome(options=options, version_main=None, driver_executable_path=driver_path)
                 logger.debug("✅ Chrome driver created (Method 1)")
-                try:
-                    svc = getattr(self.driver, 'service', None)
-                    proc = getattr(svc, 'process', None) if svc else None
-                    if proc and getattr(proc, 'pid', None):
-                        logger.debug(f"🔎 Driver PID: {proc.pid}")
-                except Exception:
-                    pass
+                logger.debug("🔎 Driver PID: %s", _service_pid(self.driver))
             except Exception as e1:
                 logger.exception(f"Method 1 failed: {e1}")
                 try:
                     # Method 2: With use_subprocess=False
-                    self.driver = uc.Chrome(options=options, version_main=None, use_subprocess=False)
+                    self.driver = uc.Chrome(options=options, version_main=None, use_subprocess=False, driver_executable_path=driver_path)
                     logger.debug("✅ Chrome driver created (Method 2)")
                 except Exception as e2:
                     logger.exception(f"Method 2 failed: {e2}")
@@ -246,6 +552,7 @@ class AfterPayBatchValidator:
                     regular_options.add_argument('--no-sandbox')
                     regular_options.add_argument('--disable-dev-shm-usage')
                     regular_options.add_argument('--window-size=500,500')
+                    regular_options.page_load_strategy = 'eager'
                     if chrome_binary:
                         regular_options.binary_location = chrome_binary
                     self.driver = webdriver.Chrome(options=regular_options)
@@ -282,21 +589,36 @@ class AfterPayBatchValidator:
             except Exception:
                 pass
 
-            # Set timeouts to prevent hanging - Increased for slow connections
+            # Set timeouts to prevent hanging. With the 'eager' strategy get() only waits for
+            # DOMContentLoaded, so 30s still leaves slow connections plenty of room
             try:
-                self.driver.set_page_load_timeout(90)
+                self.driver.set_page_load_timeout(30)
                 self.driver.set_script_timeout(90)
             except Exception:
                 pass
 
-            # Set window size explicitly after creation with retry
-            for _ in range(3):
+            # Block images/fonts/trackers to cut per-email page-load bytes
+            try:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URL_PATTERNS})
+                logger.debug("🚫 Blocking images/fonts/trackers via CDP")
+            except Exception as e:
+                logger.debug(f"Could not set blocked URLs: {e}")
+
+            # Headless Chrome announces itself as "HeadlessChrome"; report the regular brand instead
+            if self.headless:
+                self._mask_headless_user_agent()
+
+            # Set window size (and position) explicitly after creation in one call; retry once if
+            # the window isn't ready yet. Headless windows are never shown, so skip it there.
+            for _ in range(0 if self.headless else 2):
                 try:
-                    self.driver.set_window_size(500, 500)
                     if self.window_position:
                         x, y = self.window_position
-                        self.driver.set_window_position(x, y)
+                        self.driver.set_window_rect(x=x, y=y, width=500, height=500)
                         logger.debug(f"🖥️ Window position set to {x},{y}")
+                    else:
+                        self.driver.set_window_size(500, 500)
                     logger.debug("🖥️ Window size set to 500x500")
                     break
                 except Exception as e:
@@ -335,9 +657,7 @@ class AfterPayBatchValidator:
                     raise WebDriverException("No window handles; driver closed or not ready")
                 # Also verify the underlying process is alive if psutil is available
                 try:
-                    svc = getattr(self.driver, 'service', None)
-                    proc = getattr(svc, 'process', None) if svc else None
-                    pid = getattr(proc, 'pid', None) if proc else None
+                    pid = _service_pid(self.driver)
                     if pid and PSUTIL_AVAILABLE:
                         try:
                             p = psutil.Process(pid)
@@ -358,6 +678,8 @@ class AfterPayBatchValidator:
                             raise WebDriverException("Driver process not alive")
                 except Exception:
                     pass
+            except Exception:
+                raise
             # Try to remove navigator.webdriver via CDP (works even on frozen exe)
             try:
                 self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
@@ -369,8 +691,6 @@ class AfterPayBatchValidator:
                 logger.debug("🧩 Injected script to hide navigator.webdriver via CDP")
             except Exception as e:
                 logger.warning(f"⚠️ Failed to inject navigator.webdriver hiding script: {e}")
-            except Exception:
-                raise
             
         except Exception as e:
             logger.exception(f"❌ Error creating driver: {e}")
@@ -379,31 +699,39 @@ class AfterPayBatchValidator:
     def validate_email(self, email, timeout=60):
         """Validate single email"""
         # No try/except block here, let exceptions bubble up to browser_worker
-        logger.debug(f"🔍 Testing: {email}")
+        logger.debug("🔍 Testing: %s", email)
         
         # Go to AfterPay portal
         logger.debug("🌐 Opening AfterPay portal...")
         self.driver.get("https://portal.afterpay.com/en-US")
         
         # Wait for and find email input
-        email_input = WebDriverWait(self.driver, 60).until(
+        email_input = WebDriverWait(self.driver, 60, poll_frequency=1.0).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='email'], input[name='email']"))
         )
         logger.debug("📧 Found email input")
         
-        # Wait a bit for page to fully load
-        time.sleep(2)
-        
-        # Clear and type email
+        # Wait for the DOM to be parsed (the form's scripts have run) instead of a fixed sleep.
+        # With the 'eager' load strategy, 'complete' would mean waiting for every tracker/image again.
+        try:
+            WebDriverWait(self.driver, 5, poll_frequency=0.1).until(
+                lambda d: d.execute_script("return document.readyState") != "loading"
+            )
+        except TimeoutException:
+            logger.debug("⏳ Page still loading after 5s, continuing with email input")
+
+        # Clear and set email in a single script call (instead of one send_keys per character).
+        # The script returns the value the field ended up with; if the page's own handlers
+        # rejected it, fall back to one send_keys call with the whole address.
         email_input.clear()
-        for char in email:
-            email_input.send_keys(char)
-            time.sleep(0.02)
-        
-        logger.debug(f"⌨️ Typed: {email}")
+        if self.driver.execute_script(_SET_INPUT_VALUE_JS, email_input, email) != email:
+            email_input.clear()
+            email_input.send_keys(email)
+
+        logger.debug("⌨️ Typed: %s", email)
         
         # Find and click continue button
-        continue_button = WebDriverWait(self.driver, 30).until(
+        continue_button = WebDriverWait(self.driver, 30, poll_frequency=0.5).until(
             EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))
         )
         logger.debug("🔘 Found button")
@@ -414,94 +742,104 @@ class AfterPayBatchValidator:
         continue_button.click()
         logger.debug("👆 Clicked Continue")
         
-        # IMPORTANT: Give page time to process the request before checking for errors
-        # This prevents false positives from transient loading states
-        logger.debug("⏳ Waiting for page to process (2s grace period)...")
-        time.sleep(2.0)  # Grace period to let page start processing
-        
         # Wait for page transition (Valid -> Redirect, Invalid -> Error msg)
-        # Max wait 60 seconds total, checking every 0.2s (less aggressive)
+        # Max wait 60 seconds total. Each poll is one small script call returning URL, password-field
+        # presence and a bounded slice of the visible text, instead of the full page_source.
         early_invalid_marker = None
         unknown_error_detected = False
         unknown_error_count = 0  # Count how many times we see the error (must be persistent)
-        
-        logger.debug("🔍 Starting page transition monitoring...")
-        
-        for iteration in range(300):  # 300 * 0.2s = 60 seconds max
-            time.sleep(0.2)
-            try:
-                curr_url = self.driver.current_url
-                # Check if URL changed
-                if curr_url != initial_url:
-                    logger.debug(f"🔄 URL changed: {initial_url} -> {curr_url}")
-                    break # Found URL change, stop waiting
-                
-                src = self.driver.page_source.lower()
-                
-                # 2. Check for invalid markers FIRST (these are definitive and should not trigger restart)
-                if "account not found" in src:
-                    early_invalid_marker = "account not found"
-                    logger.debug("❌ Found 'account not found' marker")
-                    break
-                if "couldn't find" in src or "we couldn't find" in src:
-                    early_invalid_marker = "couldn't find"
-                    logger.debug("❌ Found 'couldn't find' marker")
-                    break
-                
-                # 1. Check for restart trigger (Unknown error) - BUT ONLY after initial grace period
-                # AND it must appear MULTIPLE times to avoid false positives
-                if iteration >= 10:  # Only start checking after 2+ seconds (10 * 0.2s)
-                    if "an unknown error occurred" in src or "unknown error occurred" in src:
-                        unknown_error_count += 1
-                        if unknown_error_count >= 3:  # Must see error 3 times in a row (0.6s persistent)
-                            logger.warning("⚠️ Persistent 'An unknown error occurred' detected. Triggering restart...")
-                            unknown_error_detected = True
-                            raise BrowserDetectedException("An unknown error occurred. Please try again (restart browser)")
-                    else:
-                        # Reset counter if error disappears (it was transient)
-                        if unknown_error_count > 0:
-                            logger.debug(f"ℹ️ Unknown error cleared (was seen {unknown_error_count} times)")
-                        unknown_error_count = 0
+        last_status = {}  # Last probe result, reused after the wait instead of re-querying the driver
+        monitor_start = time.time()
 
-            except BrowserDetectedException:
-                raise
+        def _page_transitioned(driver):
+            nonlocal early_invalid_marker, unknown_error_detected, unknown_error_count, last_status
+            try:
+                status = driver.execute_script(_PAGE_STATUS_JS) or {}
             except Exception:
-                pass
+                return False
+            last_status = status
+
+            # Check if URL changed or the password step appeared
+            curr_url = status.get('url') or ''
+            if curr_url != initial_url:
+                logger.debug("🔄 URL changed: %s -> %s", initial_url, curr_url)
+                return True
+            if status.get('hasPw'):
+                logger.debug("🔑 Password field appeared")
+                return True
+
+            src = status.get('body') or ''
+
+            # 2. Check for invalid markers FIRST (these are definitive and should not trigger restart)
+            if "account not found" in src:
+                early_invalid_marker = "account not found"
+                logger.debug("❌ Found 'account not found' marker")
+                return True
+            if "couldn't find" in src or "we couldn't find" in src:
+                early_invalid_marker = "couldn't find"
+                logger.debug("❌ Found 'couldn't find' marker")
+                return True
+
+            # 1. Check for restart trigger (Unknown error) - BUT ONLY after initial grace period
+            # AND it must appear MULTIPLE times to avoid false positives.
+            # Monitoring starts right after the click, so give the page 4s to process the request
+            # before an error message can count (same window as the former fixed 2s sleep + 2s).
+            if time.time() - monitor_start >= 4.0:
+                if "an unknown error occurred" in src or "unknown error occurred" in src:
+                    unknown_error_count += 1
+                    if unknown_error_count >= 3:  # Must see error 3 polls in a row (~0.9s persistent)
+                        logger.warning("⚠️ Persistent 'An unknown error occurred' detected. Triggering restart...")
+                        unknown_error_detected = True
+                        raise BrowserDetectedException("An unknown error occurred. Please try again (restart browser)")
+                else:
+                    # Reset counter if error disappears (it was transient)
+                    if unknown_error_count > 0:
+                        logger.debug("ℹ️ Unknown error cleared (was seen %d times)", unknown_error_count)
+                    unknown_error_count = 0
+            return False
+
+        logger.debug("🔍 Starting page transition monitoring...")
+        try:
+            WebDriverWait(self.driver, 60, poll_frequency=0.3).until(_page_transitioned)
+        except TimeoutException:
+            logger.debug("⏳ No page transition detected within 60s")
 
         # First try to detect presence of a password field using DOM elements (reliable indicator of valid account)
-        password_present = False
-        if not early_invalid_marker:
+        # If the transition probe already saw it, there is nothing left to wait for
+        password_present = bool(last_status.get('hasPw'))
+        if not early_invalid_marker and not password_present:
+            # Poll only for the password input; the full-text snapshot is taken once below
+            def _password_shown(driver):
+                try:
+                    return driver.execute_script(_PASSWORD_PRESENT_JS)
+                except Exception:
+                    return False
+
             try:
-                pw_elem = WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='password'], input[name='password']"))
-                )
-                if pw_elem:
-                    password_present = True
+                WebDriverWait(self.driver, 20, poll_frequency=0.3).until(_password_shown)
+                password_present = True
             except TimeoutException:
                 password_present = False
         
-        # Check final URL (this is the validated page URL)
-        final_url = self.driver.current_url
+        # Final URL + visible page text in one probe instead of current_url + full page_source
+        # (the serialized HTML can be hundreds of KB; the markers only ever appear in visible text)
+        snapshot = self._page_snapshot()
+        final_url = snapshot.get('url') or self.driver.current_url
+        password_present = password_present or bool(snapshot.get('hasPw'))
+        page_source = snapshot.get('body') or ''
         validated_page = final_url
-        logger.debug(f"🌐 Final URL: {final_url}")
-
-        # Also check page content for bot detection/corruption and classify result
-        page_source = ''
-        try:
-            page_source = self.driver.page_source
-        except Exception:
-            pass
+        logger.debug("🌐 Final URL: %s", final_url)
 
         # Check specifically for "An unknown error occurred. Please try again."
         # This indicates the browser needs restart, but ONLY if:
         # 1. We didn't already detect it during polling (avoid duplicate detection)
         # 2. We don't have an explicit invalid marker (account not found takes precedence)
         # 3. The URL hasn't changed (if redirected to password page, ignore any transient errors)
+        # page_source is the probe's already-lowercased text, so no extra .lower() copy here
         if not early_invalid_marker and not unknown_error_detected and not password_present:
-            ps_lower = page_source.lower()
-            if "an unknown error occurred" in ps_lower or "unknown error occurred" in ps_lower:
+            if final_url == initial_url and _UNKNOWN_ERROR_RE.search(page_source):
                 # Only trigger restart if BOTH conditions: error message + still on same page
-                if "please try again" in ps_lower and final_url == initial_url:
+                if "please try again" in page_source:
                     logger.warning("⚠️ Final check: Detected persistent 'An unknown error occurred'. Triggering browser restart...")
                     raise BrowserDetectedException("An unknown error occurred. Please try again (restart browser)")
 
@@ -512,7 +850,7 @@ class AfterPayBatchValidator:
             # We found an invalid marker during the polling loop
             is_valid, is_invalid, is_detection, reason = False, True, False, f'invalid_marker:{early_invalid_marker}'
         else:
-            is_valid, is_invalid, is_detection, reason = classify_page(final_url, page_source)
+            is_valid, is_invalid, is_detection, reason = classify_page(final_url, page_source, lowered=True)
             
             # Override: If URL changed and no explicit invalid/detection found, mark as valid
             # Even if classify_page returned fallback_invalid, if URL changed, it's valid.
@@ -522,19 +860,37 @@ class AfterPayBatchValidator:
                 is_invalid = False
                 reason = 'url_changed_redirect'
             
-            logger.debug(f"🔎 Classification: valid={is_valid} invalid={is_invalid} detect={is_detection} reason={reason}")
+            logger.debug("🔎 Classification: valid=%s invalid=%s detect=%s reason=%s", is_valid, is_invalid, is_detection, reason)
 
             # If ambiguous fallback invalid AND URL didn't change, give it one quick retry to avoid false negatives
             if is_invalid and reason == 'fallback_invalid' and final_url == initial_url:
-                logger.debug(f"⚠️ Ambiguous result for {email}, re-checking once before marking invalid...")
-                time.sleep(1.5)
-                final_url = self.driver.current_url
+                logger.debug("⚠️ Ambiguous result for %s, re-checking once before marking invalid...", email)
+                # Give the page up to 1.5s to settle, but re-check as soon as something decisive shows
+                # up (redirect, password step, invalid/detection marker) instead of a fixed sleep
+                recheck = [snapshot]
+
+                def _page_settled(driver):
+                    try:
+                        status = driver.execute_script(_PAGE_STATUS_JS, 0) or {}
+                    except Exception:
+                        return False
+                    recheck[0] = status
+                    body = status.get('body') or ''
+                    return (status.get('url', initial_url) != initial_url or status.get('hasPw')
+                            or _INVALID_MARKER_RE.search(body) or _DETECTION_MARKER_RE.search(body))
+
                 try:
-                    page_source = self.driver.page_source
-                except Exception:
-                    page_source = ''
-                is_valid2, is_invalid2, is_detection2, reason2 = classify_page(final_url, page_source)
-                logger.debug(f"🔁 Re-check classification: valid={is_valid2} invalid={is_invalid2} detect={is_detection2} reason={reason2}")
+                    WebDriverWait(self.driver, 1.5, poll_frequency=0.3).until(_page_settled)
+                except TimeoutException:
+                    pass
+                snapshot = recheck[0]
+                final_url = snapshot.get('url') or self.driver.current_url
+                page_source = snapshot.get('body') or ''
+                if snapshot.get('hasPw'):
+                    is_valid2, is_invalid2, is_detection2, reason2 = True, False, False, 'password_field_found'
+                else:
+                    is_valid2, is_invalid2, is_detection2, reason2 = classify_page(final_url, page_source, lowered=True)
+                logger.debug("🔁 Re-check classification: valid=%s invalid=%s detect=%s reason=%s", is_valid2, is_invalid2, is_detection2, reason2)
                 # keep detection if seen
                 if is_detection2:
                     raise BrowserDetectedException(f"Browser detected/blocked due to: {reason2}")
@@ -557,72 +913,41 @@ class AfterPayBatchValidator:
             try:
                 # Only attempt this if we're on the password page or password field exists
                 if '/password' in (final_url or '').lower() or password_present:
-                    forgot_elem = None
-                    try:
-                        forgot_elem = self.driver.find_element(By.XPATH, "//a[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'forgot')]")
-                    except Exception:
-                        try:
-                            forgot_elem = self.driver.find_element(By.XPATH, "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'forgot')]")
-                        except Exception:
-                            forgot_elem = None
-                    if forgot_elem:
+                    # One JS call finds and clicks the link/button instead of several case-insensitive XPath lookups
+                    if self.driver.execute_script(_CLICK_FORGOT_JS):
+                        logger.debug("🔗 Clicked 'Forgot password?' link to reach verification page...")
+                        # Wait until the verification text is rendered; each poll is one probe round-trip
                         try:
-                            logger.debug("🔗 Clicking 'Forgot password?' link to reach verification page...")
-                            forgot_elem.click()
-                            # Wait for verification page or the text 'ending in' to appear
-                            WebDriverWait(self.driver, 10).until(lambda d: '/create-password-verify' in (d.current_url or '').lower() or 'ending in' in (d.page_source or '').lower())
-                            # Update final_url & verification_page
-                            # Update verification_page; keep validated_page as the original password page
-                            verification_page = self.driver.current_url
-                            # NOTE: Removed logging of the full verification page URL for privacy/verbosity
-                            # Attempt to find the masked phone number
-                            try:
-                                el = WebDriverWait(self.driver, 7).until(
-                                    EC.presence_of_element_located((By.XPATH, "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'ending in') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'ending with')]") )
-                                )
-                                txt = el.text.strip() if el and hasattr(el, 'text') else ''
-                                # Extract masked part like '••• 05' or last digits if masked not present
-                                m = re.search(r'ending in\s*([•\*x\s\d]+)', txt, flags=re.I)
-                                if m:
-                                    phone_ending = m.group(1).strip()
-                                    logger.info(f"📱 Phone ending found: {phone_ending}")
-                                else:
-                                    # fallback to capture last digit group
-                                    dig = re.search(r'(\d{2,4})', txt)
-                                    if dig:
-                                        phone_ending = f"••• {dig.group(1)}"
-                            except TimeoutException:
-                                # fallback - attempt to parse from page source
-                                try:
-                                    ps = (self.driver.page_source or '').lower()
-                                    m2 = re.search(r'ending in\s*([•\*x\s\d]+)', ps, flags=re.I)
-                                    if m2:
-                                        phone_ending = m2.group(1).strip()
-                                    else:
-                                        d2 = re.search(r'(\d{2,4})', ps)
-                                        if d2:
-                                            phone_ending = f"••• {d2.group(1)}"
-                                            logger.info(f"📱 Phone ending found (fallback digits): {phone_ending}")
-                                except Exception:
-                                    pass
-                        except Exception as e:
-                            logger.debug(f"🔍 Could not click 'Forgot password?' or fetch verification info: {e}")
+                            status = WebDriverWait(self.driver, 15, poll_frequency=0.3).until(_verification_status)
+                        except TimeoutException:
+                            # Parse whatever the page shows now
+                            status = self._page_snapshot()
+                        # Update verification_page; keep validated_page as the original password page
+                        # NOTE: Removed logging of the full verification page URL for privacy/verbosity
+                        verification_page = status.get('url') or self.driver.current_url
+                        txt = status.get('body') or ''
+                        # Extract masked part like '••• 05' or last digits if masked not present
+                        m = _ENDING_RE.search(txt)
+                        if m:
+                            phone_ending = m.group(1).strip()
+                            logger.info(f"📱 Phone ending found: {phone_ending}")
+                        elif 'ending' in txt:
+                            # fallback to capture the digit group following 'ending ...'
+                            dig = _DIGIT_GROUP_RE.search(txt, txt.find('ending'))
+                            if dig:
+                                phone_ending = f"••• {dig.group(1)}"
+                                logger.info(f"📱 Phone ending found (fallback digits): {phone_ending}")
             except Exception as e:
-                logger.debug(f"🔍 Error during 'Forgot password?' handling: {e}")
+                logger.debug("🔍 Could not click 'Forgot password?' or fetch verification info: %s", e)
         else:
             logger.info(f"❌ INVALID: {email}")
         
-        # Small delay to allow visual confirmation if user is watching
-        time.sleep(1.0)
-        
         # Compute display string for GUI/file output
         display = None
         try:
             if is_valid:
                 if phone_ending:
-                    digits = re.search(r"(\d{1,})", phone_ending or '')
-                    mask = f"***{digits.group(1)}" if digits else phone_ending
-                    display = f"✅ VALID - {email} |  {mask}"
+                    display = f"✅ VALID - {email} |  {_mask_phone_ending(phone_ending)}"
                 else:
                     display = f"✅ VALID - {email}"
             else:
@@ -637,64 +962,78 @@ class AfterPayBatchValidator:
             'validation_page': validated_page,
             'verification_page': verification_page,
             'phone_ending': phone_ending,
-            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': _cached_ts(),
             'display': display
         }
     
+    def _mask_headless_user_agent(self):
+        """Override the User-Agent and sec-ch-ua client hints so headless Chrome looks like regular Chrome.
+
+        The real UA is reused with only the brand changed, so the version always matches the binary.
+        """
+        try:
+            ua = self.driver.execute_script("return navigator.userAgent") or ''
+            if 'HeadlessChrome' not in ua:
+                return
+            ua = ua.replace('HeadlessChrome', 'Chrome')
+            m = _CHROME_MAJOR_RE.search(ua)
+            major = m.group(1) if m else ''
+            platform = {'win32': 'Windows', 'darwin': 'macOS'}.get(sys.platform, 'Linux')
+            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                'userAgent': ua,
+                'userAgentMetadata': {
+                    'brands': [
+                        {'brand': 'Chromium', 'version': major},
+                        {'brand': 'Google Chrome', 'version': major},
+                        {'brand': 'Not_A Brand', 'version': '24'},
+                    ],
+                    'platform': platform,
+                    'platformVersion': '',
+                    'architecture': '',
+                    'model': '',
+                    'mobile': False,
+                },
+            })
+            logger.debug(f"🕶️ Headless user agent masked: {ua}")
+        except Exception as e:
+            logger.debug(f"Could not override user agent: {e}")
+
+    def _page_snapshot(self):
+        """Return {url, hasPw, body} for the current page (full visible text, lowercased); {} on failure."""
+        try:
+            return self.driver.execute_script(_PAGE_STATUS_JS, 0) or {}
+        except Exception:
+            return {}
+
     def close(self):
-        """Close browser"""
+        """Close browser: quit() once, then kill whatever is left of the driver's process tree"""
         try:
             if self.driver:
+                # Read the driver PID (and its Popen, for the no-psutil fallback) up front; quit() tears the service down
+                pid = _service_pid(self.driver)
+                proc = getattr(getattr(self.driver, 'service', None), 'process', None)
                 try:
-                    # Try to gracefully close, prefer driver.close() then quit()
-                    try:
-                        if hasattr(self.driver, 'close'):
-                            try:
-                                self.driver.close()
-                            except Exception:
-                                pass
-                        self.driver.quit()
-                        logger.debug("🚪 Browser closed (quit called)")
-                    except Exception as inner_e:
-                        # Some drivers (mock) may not have quit/close; ignore and continue to force kill
-                        logger.warning(f"⚠️ Error calling driver.close()/quit(): {inner_e}")
+                    # quit() closes every window itself; a separate close() is just another round trip
+                    self.driver.quit()
+                    logger.debug("🚪 Browser closed (quit called)")
                 except Exception as e:
+                    # Some drivers (mock) may not have quit; ignore and continue to force kill
                     logger.warning(f"⚠️ Error calling driver.quit(): {e}")
-                # (Deprecated older termination block removed)
                 # Ensure process killed if still running - Windows compatible
                 try:
-                    svc = getattr(self.driver, 'service', None)
-                    proc = getattr(svc, 'process', None) if svc else None
-                    pid = getattr(proc, 'pid', None) if proc else None
                     if pid:
-                        # Windows-compatible process termination
                         if PSUTIL_AVAILABLE:
                             try:
-                                p = psutil.Process(pid)
-                                # Kill all children first
-                                children = p.children(recursive=True)
-                                for c in children:
-                                    try:
-                                        c.kill()
-                                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                        pass
-                                # Wait for children to terminate
-                                gone, alive = psutil.wait_procs(children, timeout=1)
-                                # Kill parent process
-                                try:
-                                    p.kill()
-                                    p.wait(timeout=2)
+                                if _kill_process_tree(pid):
                                     logger.debug(f"🧹 Killed driver process PID {pid} (via psutil)")
-                                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                                    pass
-                            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                                logger.debug(f"Process {pid} already terminated or access denied: {e}")
+                                else:
+                                    logger.debug(f"Process {pid} already terminated")
                             except Exception as e:
                                 logger.warning(f"⚠️ Error killing process {pid} with psutil: {e}")
                         else:
                             # Fallback without psutil - use subprocess.Popen.kill()
                             try:
-                                if hasattr(proc, 'kill') and callable(proc.kill):
+                                if proc is not None and proc.poll() is None:
                                     proc.kill()
                                     logger.debug(f"🧹 Killed driver process PID {pid} (via proc.kill)")
                             except Exception as e:
@@ -709,18 +1048,23 @@ class AfterPayBatchValidator:
                 except Exception as e:
                     logger.warning(f"⚠️ Could not remove profile dir {self.profile_dir}: {e}")
                 finally:
+                    _live_profile_dirs.discard(self.profile_dir)
                     self.profile_dir = None
         except Exception as e:
             logger.error(f"Error closing browser: {e}")
 
-    def wait_until_ready(self, check_url: str = "https://portal.afterpay.com/en-US", timeout: int = 20) -> bool:
+    def wait_until_ready(self, check_url: str = "https://portal.afterpay.com/en-US", timeout: int = 20,
+                         poll_initial: float = 0.02, poll_max: float = 0.5) -> bool:
         """Attempt to ensure driver is responsive.
         
         We perform a simple liveness check instead of loading the full portal to speed up startup.
+        Failed checks are retried with exponential backoff (poll_initial doubling up to poll_max),
+        so a driver that is already up returns at once and a slow one isn't hammered.
         """
         if not self.driver:
             return False
         start = time.time()
+        interval = poll_initial
         try:
             # Keep trying until timeout
             while time.time() - start < timeout:
@@ -741,133 +1085,507 @@ class AfterPayBatchValidator:
                         except Exception:
                             pass
                     logger.debug(f"Waiting for browser readiness: {inner_e}")
-                    time.sleep(0.5)
+                    time.sleep(max(0, min(interval, timeout - (time.time() - start))))
+                    interval = min(interval * 2, poll_max)
             return False
         except Exception as e:
             logger.warning(f"⚠️ Browser readiness check failed: {e}")
             return False
 
+# Process names worth reading the commandline of during the orphan sweep
+# (chrome / chromium / chromedriver / undetected_chromedriver binaries)
+_DRIVER_PROCESS_NAME_RE = re.compile(r'chrom|undetect', re.I)
+# Commandline markers of drivers we started ('undetect' also covers 'undetected_chromedriver');
+# bytes, so /proc cmdlines are matched without decoding
+_ORPHAN_CMDLINE_RE = re.compile(rb'ap_profile_|undetect')
+
+
+# On Linux the orphan sweep reads /proc directly: one small read of /proc/<pid>/stat per
+# process gives both the (15-char truncated) name and the start time, without psutil's per-process overhead
+_PROC_SCAN_AVAILABLE = sys.platform.startswith('linux') and os.path.isdir('/proc')
+
+
+def _read_proc_cmdline(pid):
+    """Raw /proc/<pid>/cmdline (NUL-separated bytes)."""
+    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+        return f.read()
+
+
+def _proc_driver_candidates():
+    """Yield (pid, (pid, start_time), read_cmdline) for Chrome/chromedriver-named processes via /proc.
+
+    read_cmdline() returns the commandline as bytes (arguments separated by NUL or space).
+    """
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read().decode('utf-8', 'replace')
+            # "pid (comm) state ppid ..." - comm may contain spaces/parens, so split on the last ')'
+            name = stat[stat.find('(') + 1:stat.rfind(')')]
+            if not _DRIVER_PROCESS_NAME_RE.search(name):
+                continue
+            start_time = stat[stat.rfind(')') + 2:].split()[19]
+        except (OSError, IndexError):
+            continue
+        pid = int(entry)
+        yield pid, (pid, start_time), lambda pid=pid: _read_proc_cmdline(pid)
+
+
+def _psutil_driver_candidates():
+    """Yield (pid, (pid, create_time), read_cmdline) for Chrome/chromedriver-named processes via psutil.
+
+    Plain process_iter() plus lazy per-process calls: no attrs/as_dict pass over every process, and
+    create_time is only fetched (in the same oneshot() as the name) for the few name matches.
+    """
+    for p in psutil.process_iter():
+        try:
+            with p.oneshot():
+                if not _DRIVER_PROCESS_NAME_RE.search(p.name() or ''):
+                    continue
+                create_time = p.create_time()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+        pid = p.pid
+        yield pid, (pid, create_time), lambda p=p: ' '.join(p.cmdline() or ()).encode('utf-8', 'replace')
+
+
+def _kill_pids_psutil(pids):
+    """Kill processes (and their children) by PID in one batch via psutil."""
+    pids = [pid for pid in pids if pid]
+    if pids:
+        try:
+            _kill_process_tree(*pids)
+        except Exception:
+            pass
+
+
+def _kill_pids_taskkill(pids):
+    """Windows fallback without psutil: one taskkill invocation for all PIDs."""
+    pids = [pid for pid in pids if pid]
+    if pids:
+        try:
+            args = ['taskkill', '/F', '/T']
+            for pid in pids:
+                args += ['/PID', str(pid)]
+            subprocess.run(args, capture_output=True, timeout=10)
+        except Exception:
+            pass
+
+
+def _kill_pids_noop(pids):
+    """No psutil and no taskkill: nothing we can do."""
+
+
+# psutil availability and the platform are fixed for the process lifetime, so choose once
+if PSUTIL_AVAILABLE:
+    _KILL_PIDS = _kill_pids_psutil
+elif sys.platform == 'win32':
+    _KILL_PIDS = _kill_pids_taskkill
+else:
+    _KILL_PIDS = _kill_pids_noop
+
+
+def unique_emails(lines):
+    """Stripped lines that contain '@', de-duplicated the way _split_emails does it.
+
+    Case-insensitive, first occurrence kept, so a loaded list counts exactly what a batch validates.
+    """
+    seen = set()
+    emails = []
+    for line in lines:
+        email = line.strip()
+        key = email.lower()
+        if '@' in email and key not in seen:
+            seen.add(key)
+            emails.append(email)
+    return emails
+
+
+def _split_emails(emails):
+    """Strip and de-duplicate (case-insensitively, first occurrence kept) a batch of emails.
+
+    Returns (well_formed, malformed); only the well-formed ones need a browser.
+    """
+    seen = set()
+    well_formed, malformed = [], []
+    for email in emails:
+        email = (email or '').strip()
+        key = email.lower()
+        if not email or key in seen:
+            continue
+        seen.add(key)
+        (well_formed if _EMAIL_RE.match(email) else malformed).append(email)
+    return well_formed, malformed
+
+
+def _grid_positions(count, cols=3, window_width=500, window_height=500, screen_width=1920, screen_height=1080):
+    """Window (x, y) for each of `count` browsers laid out in a grid (default 3 columns of 500x500).
+
+    A position past the assumed 1920x1080 screen wraps back to 0 on that axis.
+    """
+    positions = []
+    for i in range(count):
+        # Hitung posisi x, y agar rapi
+        row, col = divmod(i, cols)
+        pos_x = col * window_width
+        pos_y = row * window_height
+        # Pastikan tidak keluar layar (opsional)
+        if pos_x > screen_width: pos_x = 0
+        if pos_y > screen_height: pos_y = 0
+        positions.append((pos_x, pos_y))
+    return tuple(positions)
+
+
+def _backoff_delay(attempt, base=0.1, cap=5.0):
+    """Exponential backoff with jitter: a random delay in [base, min(cap, base * 2**attempt)]."""
+    return random.uniform(base, min(cap, base * (2 ** attempt)))
+
+
+# Drivers of this app that may still be running, persisted so that the next app run knows what may
+# have been left behind. One file per app instance (named "<pid>_<create_time>" of the instance), an
+# append-only log: "pid,create_time" when a driver starts, "-pid" once its worker has let go of it;
+# truncated when a batch of that instance finishes with every driver closed.
+def _known_pids_dir():
+    """Per-user state directory: %LOCALAPPDATA% on Windows, ~/.cache elsewhere."""
+    if sys.platform == 'win32':
+        return os.path.join(os.environ.get('LOCALAPPDATA') or os.path.expanduser('~'), 'ap', 'known_pids')
+    return os.path.join(os.path.expanduser('~'), '.cache', 'ap', 'known_pids')
+
+
+_KNOWN_PIDS_DIR = _known_pids_dir()
+_known_pids_lock = threading.Lock()
+_own_known_pids_file = None
+
+
+def _known_pids_file():
+    """This instance's state file (caller holds _known_pids_lock; requires psutil)."""
+    global _own_known_pids_file
+    if _own_known_pids_file is None:
+        me = os.getpid()
+        _own_known_pids_file = os.path.join(_KNOWN_PIDS_DIR, f"{me}_{int(psutil.Process(me).create_time())}")
+    return _own_known_pids_file
+
+
+def _read_known_pids(path):
+    """{pid: create_time} still listed in a state file, or None if it can't be read."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().split()
+        known = {}
+        for line in lines:
+            if line.startswith('-'):
+                known.pop(int(line[1:]), None)
+            else:
+                pid, create_time = line.split(',')
+                known[int(pid)] = float(create_time)
+        return known
+    except Exception:
+        return None
+
+
+def _load_previous_run_pids():
+    """Drivers listed by app instances that are no longer running, as {pid: create_time}.
+
+    Those instances' files are removed once read; files of instances still running are left alone.
+    Returns None when there are no such files (first run, or the state was lost).
+    """
+    try:
+        names = os.listdir(_KNOWN_PIDS_DIR)
+    except OSError:
+        return None
+    known = None
+    for name in names:
+        try:
+            owner, owner_created = map(int, name.split('_'))
+        except ValueError:
+            continue
+        if owner == os.getpid():
+            continue
+        try:
+            if abs(psutil.Process(owner).create_time() - owner_created) < 2:
+                continue  # that instance is still running
+        except psutil.Error:
+            pass
+        path = os.path.join(_KNOWN_PIDS_DIR, name)
+        entries = _read_known_pids(path)
+        if entries is None:
+            continue
+        known = known or {}
+        known.update(entries)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return known
+
+
+def _append_known_pids(line):
+    """Append one record to this instance's state file."""
+    with _known_pids_lock:
+        try:
+            os.makedirs(_KNOWN_PIDS_DIR, exist_ok=True)
+            with open(_known_pids_file(), 'a', encoding='utf-8') as f:
+                f.write(line)
+        except Exception:
+            pass
+
+
+def _remember_driver_pid(pid):
+    """Record a freshly started driver (pid + create_time guards against PID reuse)."""
+    if not PSUTIL_AVAILABLE:
+        return
+    try:
+        create_time = psutil.Process(pid).create_time()
+    except Exception:
+        return
+    _append_known_pids(f"{pid},{create_time!r}\n")
+
+
+def _forget_driver_pid(pid):
+    """A driver was unregistered by its worker (closed or being torn down): drop it from the state file."""
+    if PSUTIL_AVAILABLE:
+        _append_known_pids(f"-{pid}\n")
+
+
+def _forget_driver_pids():
+    """A batch ended with every driver closed: nothing of this instance can be left running."""
+    if not PSUTIL_AVAILABLE:
+        return
+    with _known_pids_lock:
+        try:
+            os.makedirs(_KNOWN_PIDS_DIR, exist_ok=True)
+            open(_known_pids_file(), 'w').close()
+        except Exception:
+            pass
+
+
+def _kill_previous_run_drivers(known):
+    """Kill drivers recorded by the previous run that are still alive (same pid *and* create_time)."""
+    leftovers = []
+    for pid, create_time in known.items():
+        try:
+            if abs(psutil.Process(pid).create_time() - create_time) < 1.0:
+                leftovers.append(pid)
+        except Exception:
+            pass
+    if leftovers:
+        logger.debug(f"🧹 Killing drivers left by the previous run: {leftovers}")
+        _KILL_PIDS(leftovers)
+
+
+# Whether the state files of earlier app runs were already consulted (by the first orphan sweep)
+_previous_runs_checked = False
+
+# True once a batch in this process finished without a stop and with every driver closed; the next
+# batch then has nothing of ours to sweep up. Starts False: an earlier app run may have crashed.
+_last_run_clean = False
+
+
 class AfterPayBatchProcessor:
     """Batch processor for multiple emails"""
+
+    # Fixed attribute set (no per-instance __dict__); callbacks are assigned from outside (main.py)
+    __slots__ = (
+        'num_browsers', 'headless', '_emails', '_email_counter', '_claim_lock', 'results', '_total_count', '_valid_count',
+        'progress_callback', 'summary_callback', 'processing_callback', 'progress_batch_callback',
+        'restart_callback', 'ready_callback', '_stop_event', '_resume_event',
+        'driver_startup_attempts', 'driver_startup_timeout', 'stagger_between_browsers', '_window_positions',
+        'browser_pids', '_result_q', '_executor', '_orphan_scan_seen', '_last_orphan_sweep', '_drivers_since_sweep',
+    )
     
     def __init__(self, num_browsers=3, headless=False, progress_callback=None, summary_callback=None, stop_event=None, restart_callback=None, ready_callback=None, driver_startup_attempts: int = 12, driver_startup_timeout: int = 20, stagger_between_browsers: float = 1.2):
         self.num_browsers = num_browsers
         self.headless = headless
-        self.email_queue = Queue()
-        self.results = []
-        self.results_lock = threading.Lock()
+        # Emails of the current batch; workers claim the next index from a shared counter
+        self._emails = []
+        self._email_counter = itertools.count()
+        # Pairs each claim (index + list read) against drain_pending's swap, so an email claimed
+        # as drain_pending runs is either returned to the worker or requeued, never neither
+        self._claim_lock = threading.Lock()
+        # deque.append is thread-safe, so workers store results without taking a lock
+        self.results = deque()
+        # Running totals merged from the per-worker counters when each batch joins
+        self._total_count = 0
+        self._valid_count = 0
         self.progress_callback = progress_callback
         self.summary_callback = summary_callback
         self.processing_callback = None
+        # Optional: called with a list of results instead of progress_callback once per result
+        self.progress_batch_callback = None
         self._stop_event = stop_event or threading.Event()
-        self._pause_event = threading.Event()
+        # Set while running, cleared while paused: paused workers block in wait() instead of polling
+        self._resume_event = threading.Event()
+        self._resume_event.set()
         self.restart_callback = restart_callback
         self.ready_callback = ready_callback
         # Startup attempts/timeouts configurable
         self.driver_startup_attempts = driver_startup_attempts
         self.driver_startup_timeout = driver_startup_timeout
         self.stagger_between_browsers = stagger_between_browsers
+        # Window (x, y) per browser slot, computed once for every batch of this processor
+        self._window_positions = _grid_positions(num_browsers)
         # Track PIDs for created driver processes by browser id
         self.browser_pids = {}
-        # Lock for pid registry
-        self._pid_lock = threading.Lock()
+        # No lock: in CPython, dict __setitem__/pop/clear on one key and list()/dict() copies of it
+        # each run as a single step under the GIL, which is all the registry ever does
+        # Finished (browser_id, result) pairs from the workers; one consumer thread per batch
+        # saves them and calls progress_callback (SimpleQueue: many producers, one consumer)
+        self._result_q = queue.SimpleQueue()
+        # Worker pool, created on first use and reused by later process_emails calls
+        self._executor = None
+        # (pid, create_time) of Chrome-like processes already checked and found not to be ours
+        self._orphan_scan_seen = set()
+        # monotonic time of the last orphan sweep, and whether drivers were started since
+        self._last_orphan_sweep = None
+        self._drivers_since_sweep = False
+
+    def _get_executor(self):
+        """Return the persistent browser-worker pool (one thread per browser slot)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, self.num_browsers), thread_name_prefix='ap_browser')
+        return self._executor
+
+    def _next_email(self):
+        """Claim the next unprocessed email of the batch, or None when there are none left."""
+        with self._claim_lock:
+            idx = next(self._email_counter)
+            emails = self._emails
+        return emails[idx] if idx < len(emails) else None
+
+    def drain_pending(self):
+        """Claim and return every email no worker has started yet (e.g. to requeue them on stop).
+
+        Workers find the batch exhausted afterwards and exit.
+        """
+        with self._claim_lock:
+            start = next(self._email_counter)
+            emails, self._emails = self._emails, []
+        return emails[start:]
 
     def _register_pid(self, browser_id: int, pid: int):
-        try:
-            with self._pid_lock:
-                self.browser_pids[browser_id] = pid
-        except Exception:
-            pass
+        self.browser_pids[browser_id] = pid
+        self._drivers_since_sweep = True
+        _remember_driver_pid(pid)
+
+    # Keys shared by every failure result; _invalid_result only fills in the per-email ones
+    _INVALID_TEMPLATE = {'valid': False, 'phone_ending': None}
+
+    @staticmethod
+    def _invalid_result(email, final_url, error):
+        """Result dict for an email that could not be validated (counted and saved as invalid)."""
+        return dict(
+            AfterPayBatchProcessor._INVALID_TEMPLATE,
+            email=email,
+            final_url=final_url,
+            error=error,
+            timestamp=_cached_ts(),
+            display=f"❌ INVALID - {email}"
+        )
+
+    def _track_validator(self, browser_id: int, validator):
+        """Register a new validator's driver PID for browser_id (read once here) and return it."""
+        pid = _service_pid(getattr(validator, 'driver', None))
+        if pid:
+            self._register_pid(browser_id, pid)
+            logger.debug("🔎 Registered Browser %s PID: %s", browser_id, pid)
+        return pid
 
     def _unregister_pid(self, browser_id: int):
-        try:
-            with self._pid_lock:
-                self.browser_pids.pop(browser_id, None)
-        except Exception:
-            pass
+        """Drop browser_id from the registry; returns the PID it had (None if untracked)."""
+        pid = self.browser_pids.pop(browser_id, None)
+        if pid:
+            _forget_driver_pid(pid)
+        return pid
 
-    def _kill_pid(self, pid: int):
-        """Kill a process by PID - Windows compatible"""
-        try:
-            if PSUTIL_AVAILABLE:
-                try:
-                    p = psutil.Process(pid)
-                    for c in p.children(recursive=True):
-                        try:
-                            c.kill()
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            pass
-                    p.kill()
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    pass
-            else:
-                # Windows fallback using taskkill
-                if sys.platform == 'win32':
-                    try:
-                        subprocess.run(['taskkill', '/F', '/PID', str(pid), '/T'], 
-                                     capture_output=True, timeout=5)
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+    # Kill processes (and their children) by PID in one batch - implementation picked at import
+    _kill_pids = staticmethod(_KILL_PIDS)
 
     def cleanup_orphan_drivers(self):
         """Kill old undetected_chromedriver processes that are not tracked by this processor.
 
         This targets processes that include 'ap_profile_' or 'undetected_chromedriver' in their commandline.
+        Only Chrome/chromedriver-named processes have their commandline read, and processes already
+        found not to be ours are remembered (by pid + create_time) and skipped on later sweeps.
         """
         if not PSUTIL_AVAILABLE:
             logger.debug("psutil not available - skipping orphan driver cleanup")
             return
         
+        # First sweep of this process: consult the state files of earlier app runs. If they all
+        # closed every driver, there is nothing to scan for. Drivers they still list are killed
+        # directly; the full scan below still runs, since a dead driver's Chrome children are no
+        # longer reachable from its pid. No files at all (first run, state lost): just scan.
+        global _previous_runs_checked
+        if not _previous_runs_checked:
+            _previous_runs_checked = True
+            previous = _load_previous_run_pids()
+            if previous == {}:
+                logger.debug("🧹 Orphan sweep skipped (earlier runs closed all their drivers)")
+                return
+            if previous:
+                try:
+                    _kill_previous_run_drivers(previous)
+                except Exception:
+                    pass
+        
+        # A sweep within the last 30s with no drivers started since can't find anything new
+        now = time.monotonic()
+        if (self._last_orphan_sweep is not None and now - self._last_orphan_sweep < 30.0
+                and not self._drivers_since_sweep):
+            logger.debug("🧹 Orphan sweep skipped (recent sweep, no new drivers)")
+            return
+        self._last_orphan_sweep = now
+        self._drivers_since_sweep = False
+        
         logger.debug("🧹 Cleaning up orphan drivers...")
         start_cleanup = time.time()
         my_pid = os.getpid()
         
         try:
-            current_pids = set()
-            with self._pid_lock:
-                for v in self.browser_pids.values():
-                    if v:
-                        current_pids.add(v)
+            current_pids = set(v for v in list(self.browser_pids.values()) if v)
             
-            # Use a faster iteration if possible, and limit time
-            for p in psutil.process_iter(['pid', 'cmdline', 'create_time']):
+            seen = self._orphan_scan_seen
+            alive = set()
+            orphans = []
+            # Only Chrome/chromedriver-named processes are yielded; their commandline is read lazily
+            candidates = _proc_driver_candidates() if _PROC_SCAN_AVAILABLE else _psutil_driver_candidates()
+            for pid, key, read_cmdline in candidates:
                 # Safety timeout - don't spend more than 5 seconds cleaning up
                 if time.time() - start_cleanup > 5:
                     logger.warning("⚠️ Orphan cleanup timed out, skipping remaining checks")
                     break
                     
                 try:
-                    pid = p.info.get('pid')
-                    if pid == my_pid:
+                    if pid == my_pid or pid in current_pids:
                         continue
-                        
-                    cmdline = ' '.join(p.info.get('cmdline') or [])
-                    if not cmdline:
+                    alive.add(key)
+                    if key in seen:
                         continue
-                    
-                    # Check for our specific markers
-                    if ('ap_profile_' in cmdline or 'undetected_chromedriver' in cmdline or 'undetect' in cmdline) and pid not in current_pids:
-                        try:
-                            logger.debug(f"🧹 Killing orphan driver PID {pid}")
-                            p.kill()
-                        except Exception:
-                            pass
+                        
+                    # Check for our specific markers (one compiled scan of the raw commandline)
+                    if _ORPHAN_CMDLINE_RE.search(read_cmdline() or b''):
+                        orphans.append(pid)
+                    else:
+                        seen.add(key)
                 except Exception:
                     pass
+            # Forget processes that have exited so the cache doesn't grow without bound
+            seen.intersection_update(alive)
+            # Kill all orphans (and their children) in one batch
+            if orphans:
+                logger.debug(f"🧹 Killing orphan driver PIDs {orphans}")
+                self._kill_pids(orphans)
         except Exception as e:
             logger.warning(f"⚠️ Error during orphan cleanup: {e}")
         
     def load_emails_from_file(self, filename='list.txt'):
-        """Load emails from file"""
-        emails = []
+        """Load emails from file (duplicates dropped, first occurrence order kept)"""
         try:
+            # One read + splitlines; duplicates (any letter case) dropped, file order kept
             with open(filename, 'r', encoding='utf-8') as f:
-                for line in f:
-                    email = line.strip()
-                    if email and '@' in email:
-                        emails.append(email)
+                emails = unique_emails(f.read().splitlines())
             
             logger.info(f"📋 Loaded {len(emails)} emails from {filename}")
             return emails
@@ -879,8 +1597,15 @@ class AfterPayBatchProcessor:
             logger.error(f"❌ Error loading emails: {e}")
             return []
     
-    def browser_worker(self, browser_id, window_position=None):
-        """Worker thread for processing emails"""
+    def browser_worker(self, browser_id, window_position=None, start_delay=0.0):
+        """Worker thread for processing emails.
+
+        Waits start_delay seconds (cut short by stop) before launching its browser.
+        Returns ``(processed, valid)`` counts for this worker; they are summed once the batch joins.
+        """
+        processed = valid = 0
+        if start_delay > 0 and self._stop_event.wait(start_delay):
+            return processed, valid
         logger.debug(f"🚀 Browser {browser_id} starting...")
         
         try:
@@ -888,8 +1613,7 @@ class AfterPayBatchProcessor:
             max_startup_attempts = self.driver_startup_attempts
             while not self._stop_event.is_set():
                 # If paused before starting, wait until resumed
-                while self._pause_event.is_set() and not self._stop_event.is_set():
-                    time.sleep(0.2)
+                self._wait_while_paused()
 
                 validator = None
                 for attempt in range(1, max_startup_attempts + 1):
@@ -901,13 +1625,7 @@ class AfterPayBatchProcessor:
                             logger.debug(f"✅ Validator for browser {browser_id} confirmed ready (attempt {attempt})")
                             # Register pid and notify readiness
                             try:
-                                svc = getattr(validator, 'service', None)
-                                proc = getattr(svc, 'process', None) if svc else None
-                                pid = getattr(proc, 'pid', None) if proc else None
-                                if pid:
-                                    with self._pid_lock:
-                                        self.browser_pids[browser_id] = pid
-                                    logger.debug(f"🔎 Registered Browser {browser_id} PID: {pid}")
+                                pid = self._track_validator(browser_id, validator)
                                 if callable(self.ready_callback):
                                     try:
                                         self.ready_callback(browser_id, pid)
@@ -933,8 +1651,10 @@ class AfterPayBatchProcessor:
                             pass
                         validator = None
                     finally:
-                        # small backoff before next attempt
-                        time.sleep(min(0.5 * attempt, 5))
+                        # jittered exponential backoff before next attempt (not after a success),
+                        # so workers that failed together don't respawn Chrome in lockstep
+                        if validator is None:
+                            self._stop_event.wait(_backoff_delay(attempt))
 
                 if not validator:
                     logger.error(f"❌ Could not create a ready validator for browser {browser_id} after {max_startup_attempts} attempts; sleeping and retrying...")
@@ -944,16 +1664,18 @@ class AfterPayBatchProcessor:
                             self.restart_callback(browser_id, 0, f"create_failed: could not create validator after {max_startup_attempts} attempts", None)
                     except Exception:
                         pass
-                    time.sleep(5)
+                    # Back off before retrying, but wake at once on stop
+                    self._stop_event.wait(5)
                     continue
                 # We've got a ready validator; break startup loop to process emails
                 break
             
-            while not self.email_queue.empty() and not self._stop_event.is_set():
+            while not self._stop_event.is_set():
                 # Ensure validator exists; if it's None (previous close failed), try creating again
                 if validator is None:
                     try:
                         validator = AfterPayBatchValidator(headless=self.headless, window_position=window_position)
+                        self._track_validator(browser_id, validator)
                         logger.debug(f"🔁 Recreated validator for browser {browser_id}")
                     except Exception as e:
                         logger.exception(f"⚠️ Could not recreate validator for browser {browser_id}: {e}")
@@ -963,19 +1685,17 @@ class AfterPayBatchProcessor:
                                 self.restart_callback(browser_id, 0, f"create_failed: could not recreate validator: {e}", None)
                         except Exception:
                             pass
-                        time.sleep(0.5)
+                        self._stop_event.wait(0.5)
                         continue
                 # Pause functionality: if pause is requested, block here until resumed or stopped
-                while self._pause_event.is_set() and not self._stop_event.is_set():
-                    time.sleep(0.2)
-                try:
-                    email = self.email_queue.get(timeout=1)
-                except Exception:
-                    # queue empty or timeout; loop again
-                    continue
+                self._wait_while_paused()
+                email = self._next_email()
+                if email is None:
+                    # Every email of the batch has been claimed (or drained on stop)
+                    break
 
                 try:
-                    logger.debug(f"🌐 Browser {browser_id} processing: {email}")
+                    logger.debug("🌐 Browser %s processing: %s", browser_id, email)
 
                     # Break early if a stop was requested
                     if self._stop_event.is_set():
@@ -985,13 +1705,15 @@ class AfterPayBatchProcessor:
                     if validator is None:
                         try:
                             validator = AfterPayBatchValidator(headless=self.headless, random_profile=True, window_position=window_position)
+                            self._track_validator(browser_id, validator)
                             if not validator.wait_until_ready(timeout=self.driver_startup_timeout):
-                                logger.warning(f"⚠️ Newly-created validator for browser {browser_id} not ready; continuing")
+                                logger.warning("⚠️ Newly-created validator for browser %s not ready; continuing", browser_id)
+                                self._unregister_pid(browser_id)
                                 validator.close()
                                 validator = None
                                 continue
                         except Exception as e:
-                            logger.warning(f"⚠️ Could not create validator for browser {browser_id}: {e}")
+                            logger.warning("⚠️ Could not create validator for browser %s: %s", browser_id, e)
                             validator = None
                             continue
 
@@ -1009,32 +1731,18 @@ class AfterPayBatchProcessor:
                     attempts = 0
                     max_retries = 2
                     result = None
-                    requeued = False
                     while attempts <= max_retries:
                         try:
                             result = validator.validate_email(email)
                             break
                         except BrowserDetectedException as bde:
                             # Explicit browser-detected error: IMMEDIATE restart with fresh profile
-                            logger.error(f"🤖 Browser {browser_id} DETECTED! Forcing immediate restart: {bde}")
+                            logger.error("🤖 Browser %s DETECTED! Forcing immediate restart: %s", browser_id, bde)
                             try:
-                                # Capture old pid if possible
-                                old_pid = None
-                                try:
-                                    svc = getattr(validator, 'service', None)
-                                    proc = getattr(svc, 'process', None) if svc else None
-                                    old_pid = getattr(proc, 'pid', None) if proc else None
-                                except Exception:
-                                    old_pid = None
-                                # Unregister the old pid from tracking
-                                try:
-                                    if old_pid:
-                                        with self._pid_lock:
-                                            self.browser_pids.pop(browser_id, None)
-                                except Exception:
-                                    pass
+                                # Capture old pid and unregister it from tracking
+                                old_pid = self._unregister_pid(browser_id)
                                 validator.close()
-                                time.sleep(1)  # Quick restart
+                                self._stop_event.wait(_backoff_delay(attempts + 1))  # Quick restart, jittered
                             except Exception:
                                 pass
                             
@@ -1050,207 +1758,92 @@ class AfterPayBatchProcessor:
                             attempts += 1
                             
                             if attempts > max_retries:
-                                logger.error(f"❌ Browser {browser_id} max retries exceeded for {email} after detection")
-                                result = {
-                                    'email': email,
-                                    'valid': False,
-                                    'final_url': f'DETECTION_ERROR: {str(bde)}',
-                                    'error': f'Browser detected after {max_retries} retries',
-                                    'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                                    'phone_ending': None,
-                                    'display': f"❌ INVALID - {email}"
-                                    ,'display': f"❌ INVALID - {email}"
-                                }
+                                logger.error("❌ Browser %s max retries exceeded for %s after detection", browser_id, email)
+                                result = self._invalid_result(email, f'DETECTION_ERROR: {str(bde)}', f'Browser detected after {max_retries} retries')
                                 break
                                 
                             # Create fresh validator with random profile IMMEDIATELY
                             try:
-                                logger.debug(f"🔄 Browser {browser_id} creating FRESH validator after detection")
+                                logger.debug("🔄 Browser %s creating FRESH validator after detection", browser_id)
                                 validator = AfterPayBatchValidator(headless=self.headless, random_profile=True, window_position=window_position)
                                 # If created, register pid
-                                try:
-                                    svc = getattr(validator, 'service', None)
-                                    proc = getattr(svc, 'process', None) if svc else None
-                                    new_pid = getattr(proc, 'pid', None) if proc else None
-                                    if new_pid:
-                                        with self._pid_lock:
-                                            self.browser_pids[browser_id] = new_pid
-                                        logger.debug(f"🔎 Registered Browser {browser_id} PID: {new_pid}")
-                                except Exception:
-                                    pass
-                                logger.debug(f"✅ Browser {browser_id} successfully restarted after detection (attempt {attempts})")
+                                self._track_validator(browser_id, validator)
+                                logger.debug("✅ Browser %s successfully restarted after detection (attempt %s)", browser_id, attempts)
                                 continue  # Retry immediately with fresh browser
                             except Exception as restart_e:
-                                logger.error(f"❌ Browser {browser_id} restart error after detection: {restart_e}")
+                                logger.error("❌ Browser %s restart error after detection: %s", browser_id, restart_e)
                                 validator = None
                                 # Break and mark as failed if can't restart
-                                result = {
-                                    'email': email,
-                                    'valid': False,
-                                    'final_url': f'RESTART_ERROR: {str(restart_e)}',
-                                    'error': f'Could not restart browser after detection',
-                                    'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                                    'phone_ending': None
-                                    ,'display': f"❌ INVALID - {email}"
-                                }
+                                result = self._invalid_result(email, f'RESTART_ERROR: {str(restart_e)}', 'Could not restart browser after detection')
                                 break
                         except WebDriverException as wde:
-                            msg = str(wde).lower()
-                            is_detection = any(m in msg for m in BOT_DETECTION_MARKERS)
+                            is_detection = bool(_ANY_DETECTION_MARKER_RE.search(str(wde)))
                             if is_detection:
-                                logger.error(f"🤖 Browser {browser_id} WebDriver DETECTION detected: {wde}")
+                                logger.error("🤖 Browser %s WebDriver DETECTION detected: %s", browser_id, wde)
                                 # Treat as detection - force immediate restart with fresh profile
                             else:
-                                logger.error(f"❌ Browser {browser_id} webdriver error: {wde}")
+                                logger.error("❌ Browser %s webdriver error: %s", browser_id, wde)
+                            # unregister and close
+                            old_pid = self._unregister_pid(browser_id)
                             try:
-                                # unregister and close
-                                try:
-                                    svc = getattr(validator, 'service', None)
-                                    proc = getattr(svc, 'process', None) if svc else None
-                                    old_pid = getattr(proc, 'pid', None) if proc else None
-                                    if old_pid:
-                                        with self._pid_lock:
-                                            self.browser_pids.pop(browser_id, None)
-                                except Exception:
-                                    pass
                                 validator.close()
-                                time.sleep(1)  # Quick restart delay
+                                self._stop_event.wait(_backoff_delay(attempts + 1))  # Quick restart delay, jittered
                             except Exception:
                                 pass
                             attempts += 1
                             if attempts > max_retries:
-                                logger.error(f"❌ Browser {browser_id} failed after {attempts} attempts for {email}")
-                                result = {
-                                    'email': email,
-                                    'valid': False,
-                                    'final_url': f'ERROR: {str(wde)}',
-                                    'error': str(wde),
-                                    'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                                    'phone_ending': None
-                                    ,'display': f"❌ INVALID - {email}"
-                                }
+                                logger.error("❌ Browser %s failed after %s attempts for %s", browser_id, attempts, email)
+                                result = self._invalid_result(email, f'ERROR: {str(wde)}', str(wde))
                                 break
                             # ALWAYS use random profile for better detection avoidance
                             try:
-                                logger.debug(f"🔄 Browser {browser_id} creating FRESH validator with random profile")
+                                logger.debug("🔄 Browser %s creating FRESH validator with random profile", browser_id)
                                 validator = AfterPayBatchValidator(headless=self.headless, random_profile=True, window_position=window_position)
-                                try:
-                                    svc = getattr(validator, 'service', None)
-                                    proc = getattr(svc, 'process', None) if svc else None
-                                    new_pid = getattr(proc, 'pid', None) if proc else None
-                                    if new_pid:
-                                        with self._pid_lock:
-                                            self.browser_pids[browser_id] = new_pid
-                                        logger.debug(f"🔎 Registered Browser {browser_id} PID: {new_pid}")
-                                except Exception:
-                                    pass
+                                self._track_validator(browser_id, validator)
                                 
-                                # Notify restart callback for GUI
+                                # Notify restart callback for GUI (old_pid = the driver that was just closed)
                                 if callable(self.restart_callback):
                                     try:
-                                        old_pid = None
-                                        try:
-                                            if validator and validator.driver:
-                                                svc = getattr(validator.driver, 'service', None)
-                                                proc = getattr(svc, 'process', None) if svc else None
-                                                old_pid = getattr(proc, 'pid', None) if proc else None
-                                        except Exception:
-                                            pass
                                         reason = "WebDriver detection" if is_detection else "WebDriver error"
                                         self.restart_callback(browser_id, attempts, reason, old_pid)
                                     except Exception:
                                         pass
                                         
-                                logger.debug(f"✅ Browser {browser_id} successfully restarted with fresh profile (attempt {attempts})")
+                                logger.debug("✅ Browser %s successfully restarted with fresh profile (attempt %s)", browser_id, attempts)
                                 continue
                             except Exception as restart_e:
-                                logger.error(f"❌ Browser {browser_id} restart error: {restart_e}")
+                                logger.error("❌ Browser %s restart error: %s", browser_id, restart_e)
                                 validator = None
                                 continue
                         except TimeoutException:
-                            logger.error(f"⏰ Timeout for: {email}")
-                            result = {
-                                'email': email,
-                                'valid': False,
-                                'final_url': 'TIMEOUT',
-                                'error': 'Timeout',
-                                'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                                'phone_ending': None
-                                ,'display': f"❌ INVALID - {email}"
-                            }
+                            logger.error("⏰ Timeout for: %s", email)
+                            result = self._invalid_result(email, 'TIMEOUT', 'Timeout')
                             break
                         except Exception as e:
-                            logger.error(f"❌ Error processing {email} on browser {browser_id}: {e}")
-                            result = {
-                                'email': email,
-                                'valid': False,
-                                'final_url': f'ERROR: {str(e)}',
-                                'error': str(e),
-                                'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                                'phone_ending': None
-                                ,'display': f"❌ INVALID - {email}"
-                            }
+                            logger.error("❌ Error processing %s on browser %s: %s", email, browser_id, e)
+                            result = self._invalid_result(email, f'ERROR: {str(e)}', str(e))
                             break
 
-                    if requeued:
-                        # If we requeued due to detection, skip result storage and do not call task_done()
-                        logger.debug(f"🔁 Skipping storing result for {email} (requeued)")
-                        continue
                     if result is None:
                         # Fallback in case
-                        result = {
-                            'email': email,
-                            'valid': False,
-                            'final_url': 'UNKNOWN',
-                            'error': 'Unknown failure',
-                            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
-                            'phone_ending': None
-                            ,'display': f"❌ INVALID - {email}"
-                        }
-
-                    # Store result
-                    with self.results_lock:
-                        self.results.append(result)
-                    
-                    # Save to file first
-                    save_email_result(
-                        result['email'],
-                        'valid' if result['valid'] else 'invalid',
-                        result.get('final_url'),
-                        result.get('phone_ending'),
-                        result.get('verification_page'),
-                        result.get('display')
-                    )
-                    
-                    # IMPORTANT: Call progress callback to update GUI (including invalid list)
-                    if self.progress_callback:
-                        try:
-                            self.progress_callback(result)
-                        except Exception as e:
-                            logger.warning(f"⚠️ Error calling progress callback: {e}")
+                        result = self._invalid_result(email, 'UNKNOWN', 'Unknown failure')
+
+                    # Store result; counted locally, merged in process_emails
+                    self.results.append(result)
+                    processed += 1
+                    if result['valid']:
+                        valid += 1
                     
-                    logger.debug(f"✅ Browser {browser_id} completed: {email} -> {'VALID' if result['valid'] else 'INVALID'}")
+                    # Saving, GUI callback and logging happen on the result consumer thread
+                    self._result_q.put((browser_id, result))
                 except Exception as e:
-                    logger.error(f"❌ Browser {browser_id} error processing {email}: {e}")
+                    logger.error("❌ Browser %s error processing %s: %s", browser_id, email, e)
                     # If we failed at outer level, continue loop to process remaining emails
-                    try:
-                        if not self.email_queue.empty():
-                            self.email_queue.task_done()
-                    except Exception:
-                        pass
                     continue
             
             # Close validator and unregister pid
             try:
-                try:
-                    svc = getattr(validator, 'service', None)
-                    proc = getattr(svc, 'process', None) if svc else None
-                    old_pid = getattr(proc, 'pid', None) if proc else None
-                    if old_pid:
-                        with self._pid_lock:
-                            self.browser_pids.pop(browser_id, None)
-                except Exception:
-                    pass
+                self._unregister_pid(browser_id)
                 if validator:
                     logger.debug(f"🔒 Closing browser {browser_id}...")
                     validator.close()
@@ -1261,88 +1854,177 @@ class AfterPayBatchProcessor:
             
         except Exception as e:
             logger.error(f"❌ Browser {browser_id} failed to start: {e}")
+        return processed, valid
     
+    # Progress notifications are grouped: delivered once PROGRESS_BATCH results are waiting or
+    # PROGRESS_INTERVAL seconds after the first of them, whichever comes first
+    PROGRESS_BATCH = 8
+    PROGRESS_INTERVAL = 0.15
+
+    def _deliver_progress(self, batch):
+        """Hand finished results to the GUI: one progress_batch_callback call, else one per result."""
+        if self.progress_batch_callback:
+            try:
+                self.progress_batch_callback(batch)
+            except Exception as e:
+                logger.warning("⚠️ Error calling progress batch callback: %s", e)
+        elif self.progress_callback:
+            # IMPORTANT: Call progress callback to update GUI (including invalid list)
+            for result in batch:
+                try:
+                    self.progress_callback(result)
+                except Exception as e:
+                    logger.warning("⚠️ Error calling progress callback: %s", e)
+
+    def _drain_results(self):
+        """Result consumer: save each (browser_id, result) from the workers and notify the GUI.
+
+        Runs on one thread per batch so browser workers only hand results off; exits on None
+        after delivering any progress still pending.
+        """
+        # Checked once per batch so per-email debug lines cost nothing when DEBUG is off
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        pending = []
+        deliver_at = 0.0
+        while True:
+            if pending:
+                try:
+                    item = self._result_q.get(timeout=max(0.0, deliver_at - time.monotonic()))
+                except queue.Empty:
+                    self._deliver_progress(pending)
+                    pending = []
+                    continue
+            else:
+                item = self._result_q.get()
+            if item is None:
+                break
+            browser_id, result = item
+            try:
+                # Save to file first
+                save_email_result(
+                    result['email'],
+                    'valid' if result['valid'] else 'invalid',
+                    result.get('final_url'),
+                    result.get('phone_ending'),
+                    result.get('verification_page'),
+                    result.get('display')
+                )
+            except Exception as e:
+                logger.error("❌ Error saving result for %s: %s", result.get('email'), e)
+
+            if debug_enabled:
+                logger.debug("✅ Browser %s completed: %s -> %s", browser_id, result['email'], 'VALID' if result['valid'] else 'INVALID')
+
+            pending.append(result)
+            if len(pending) == 1:
+                deliver_at = time.monotonic() + self.PROGRESS_INTERVAL
+            if len(pending) >= self.PROGRESS_BATCH:
+                self._deliver_progress(pending)
+                pending = []
+        if pending:
+            self._deliver_progress(pending)
+
     def process_emails(self, emails):
         """Process list of emails with multiple browsers"""
         if not emails:
             logger.error("❌ No emails to process!")
             return
         
-        # Before starting, cleanup orphan drivers from previous runs
-        try:
-            self.cleanup_orphan_drivers()
-        except Exception:
-            pass
-        # Add emails to queue
-        for email in emails:
-            self.email_queue.put(email)
+        global _last_run_clean
+        # Before starting, cleanup orphan drivers from previous runs (unless the last one exited cleanly)
+        if not _last_run_clean:
+            try:
+                self.cleanup_orphan_drivers()
+            except Exception:
+                pass
+        # Until this batch finishes cleanly, the next one has to sweep again
+        _last_run_clean = False
+        # Drop duplicates and settle malformed addresses up front, without a browser
+        emails, malformed = _split_emails(emails)
+        # Publish the batch; workers claim emails by index until the list is exhausted
+        self._email_counter = itertools.count()
+        self._emails = emails
+        num_workers = min(max(1, self.num_browsers), len(emails))
+        consumer = threading.Thread(target=self._drain_results, name='ap_results', daemon=True)
+        consumer.start()
         
         logger.info(f"🚀 Starting batch validation with {self.num_browsers} browsers...")
         logger.info(f"📊 Total emails to process: {len(emails)}")
+        if malformed:
+            logger.info(f"✂️ {len(malformed)} malformed emails marked invalid without a browser")
+            for email in malformed:
+                result = self._invalid_result(email, 'SYNTAX', 'Invalid email syntax')
+                self.results.append(result)
+                self._result_q.put((0, result))
+            self._total_count += len(malformed)
         
         start_time = time.time()
         
-        # Start browser threads
-        threads = []
-        screen_width = 1920  # Asumsi resolusi standar
-        screen_height = 1080
-        window_width = 500
-        window_height = 500
-        
-        # Hitung posisi grid (misal 3 kolom)
-        cols = 3
-        
-        for i in range(min(self.num_browsers, len(emails))):
+        # Start one long-lived worker per browser on the persistent pool; each worker owns its
+        # validator and claims emails from the shared batch until it is exhausted
+        executor = self._get_executor()
+        futures = []
+        start_delay = 0.0
+        for i in range(num_workers):
             browser_id = i + 1
-            
-            # Hitung posisi x, y agar rapi
-            row = i // cols
-            col = i % cols
-            pos_x = col * window_width
-            pos_y = row * window_height
-            
-            # Pastikan tidak keluar layar (opsional)
-            if pos_x > screen_width: pos_x = 0
-            if pos_y > screen_height: pos_y = 0
-            
-            thread = threading.Thread(target=self.browser_worker, args=(browser_id, (pos_x, pos_y)))
-            thread.start()
-            threads.append(thread)
-            # Stagger browser starts to reduce simultaneous resource spike
+            futures.append(executor.submit(self.browser_worker, browser_id, self._window_positions[i], start_delay))
+            # Stagger browser starts to reduce simultaneous resource spike; each worker waits out
+            # its own offset, so submitting them does not block here
+            start_delay += self.stagger_between_browsers + random.uniform(0, 0.6)
+        
+        # Wait for all workers to complete (the pool threads stay up for the next batch)
+        wait_futures(futures)
+        for future in futures:
             try:
-                import random
-                delay = self.stagger_between_browsers + random.uniform(0, 0.6)
+                processed, valid = future.result()
             except Exception:
-                delay = self.stagger_between_browsers
-            time.sleep(delay)
+                continue
+            self._total_count += processed
+            self._valid_count += valid
+        # Every worker is done: let the consumer finish what is queued, then stop it
+        self._result_q.put(None)
+        consumer.join()
+        # Each worker unregisters its driver before closing it, so an empty registry after an
+        # unstopped batch means nothing was left behind
+        if not self._stop_event.is_set() and not self.browser_pids:
+            _last_run_clean = True
+            _forget_driver_pids()
         
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
+        # Make sure every result is on disk before reporting
+        _result_writer.flush()
         
         end_time = time.time()
         total_time = end_time - start_time
         
-        # Calculate stats
-        valid_count = sum(1 for r in self.results if r['valid'])
-        invalid_count = len(self.results) - valid_count
-        emails_per_minute = (len(self.results) / total_time) * 60 if total_time > 0 else 0
+        # Calculate stats from the merged counters (no pass over the result dicts)
+        total_count = self._total_count
+        valid_count = self._valid_count
+        invalid_count = total_count - valid_count
+        emails_per_minute = (total_count / total_time) * 60 if total_time > 0 else 0
         
-        # Print results
-        print("\n" + "="*60)
-        print("📋 BATCH VALIDATION RESULTS")
-        print("="*60)
-        print(f"⏰ Total time: {total_time:.1f} seconds")
-        print(f"📊 Total emails: {len(self.results)}")
-        print(f"✅ Valid emails: {valid_count}")
-        print(f"❌ Invalid emails: {invalid_count}")
-        print(f"⚡ Speed: {emails_per_minute:.1f} emails/minute")
-        print(f"💾 Results saved to: valid.txt & invalid.txt")
-        print("="*60)
+        # Print results (one write + flush for the whole block)
+        report = "\n".join((
+            "",
+            "="*60,
+            "📋 BATCH VALIDATION RESULTS",
+            "="*60,
+            f"⏰ Total time: {total_time:.1f} seconds",
+            f"📊 Total emails: {total_count}",
+            f"✅ Valid emails: {valid_count}",
+            f"❌ Invalid emails: {invalid_count}",
+            f"⚡ Speed: {emails_per_minute:.1f} emails/minute",
+            "💾 Results saved to: valid.txt & invalid.txt",
+            "="*60,
+            "",
+        ))
+        # stdout is None under pythonw/windowed builds; print() ignored that, so do the same
+        if sys.stdout is not None:
+            sys.stdout.write(report)
+            sys.stdout.flush()
         # Call summary callback for GUI integration if provided
         summary = {
             'total_time': total_time,
-            'total_emails': len(self.results),
+            'total_emails': total_count,
             'valid_count': valid_count,
             'invalid_count': invalid_count,
             'emails_per_minute': emails_per_minute
@@ -1356,42 +2038,52 @@ class AfterPayBatchProcessor:
 
     def stop(self):
         """Set stop flag to signal worker threads to stop and cleanup all browsers"""
+        global _last_run_clean
         logger.info("🛑 Stop requested - signaling all workers to stop...")
+        _last_run_clean = False
         self._stop_event.set()
+        # Wake paused workers so they see the stop flag
+        self._resume_event.set()
+        # Release the pool threads once the running workers return (don't block the caller)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
         
         # Give threads a moment to detect stop flag and start cleanup
         time.sleep(0.5)
         
         # Force cleanup of any remaining browser PIDs
         try:
-            with self._pid_lock:
-                pids_to_kill = list(self.browser_pids.values())
+            pids_to_kill = list(self.browser_pids.values())
             
             if pids_to_kill:
                 logger.info(f"🧹 Force cleanup of {len(pids_to_kill)} browser processes...")
-                for pid in pids_to_kill:
-                    if pid:
-                        try:
-                            self._kill_pid(pid)
-                            logger.debug(f"✅ Killed browser PID: {pid}")
-                        except Exception as e:
-                            logger.warning(f"⚠️ Could not kill PID {pid}: {e}")
+                self._kill_pids(pids_to_kill)
+                logger.debug(f"✅ Killed browser PIDs: {pids_to_kill}")
                 
                 # Clear the registry
-                with self._pid_lock:
-                    self.browser_pids.clear()
+                self.browser_pids.clear()
                     
                 logger.info("✅ All browsers stopped and cleaned up")
         except Exception as e:
             logger.warning(f"⚠️ Error during stop cleanup: {e}")
 
+    def _wait_while_paused(self):
+        """Block while paused; returns on resume or stop.
+
+        stop() sets the resume event so paused workers wake immediately; the 1s timeout only
+        covers a stop_event set directly by the owner without calling stop().
+        """
+        while not self._resume_event.wait(1.0) and not self._stop_event.is_set():
+            pass
+
     def pause(self):
         """Pause processing (workers will wait between jobs)"""
-        self._pause_event.set()
+        self._resume_event.clear()
 
     def resume(self):
         """Resume processing after pause"""
-        self._pause_event.clear()
+        self._resume_event.set()
 
 def main():
     """Main function"""
@@ -177,6 +177,7 @@ class ValidationThread(QThread):
     progress = Signal(int, int, int)  # processed, valid, invalid
     log = Signal(str)
     email_processed = Signal(str, bool, str)
+    emails_processed = Signal(object)  # list of (email, valid, display), one emit per batch
     email_processing_started = Signal(str, int)  # email, browser_id
     browser_ready = Signal(int, int)  # browser_id, pid
     restart_event = Signal(int, int, str, object)  # browser_id, attempt, reason, old_pid
@@ -216,6 +217,20 @@ class ValidationThread(QThread):
                 self.email_processed.emit(result.get('email'), result.get('valid'), result.get('display'))
                 self.progress.emit(self._processed, self._valid, self._invalid)
 
+            # Batched variant used by the processor: one signal pair per group of results
+            # instead of two cross-thread signals per email
+            def progress_batch_callback(results):
+                batch = []
+                for result in results:
+                    self._processed += 1
+                    if result.get('valid'):
+                        self._valid += 1
+                    else:
+                        self._invalid += 1
+                    batch.append((result.get('email'), result.get('valid'), result.get('display')))
+                self.emails_processed.emit(batch)
+                self.progress.emit(self._processed, self._valid, self._invalid)
+
             # processing callback called when an email is dequeued and processing starts
             def processing_callback(email, browser_id):
                 self._processing += 1
@@ -235,8 +250,9 @@ class ValidationThread(QThread):
                 processor.restart_callback = _restart_cb
             except Exception:
                 pass
-            # Attach processing callback
+            # Attach processing and batched progress callbacks
             try:
+                processor.progress_batch_callback = progress_batch_callback
                 processor.processing_callback = processing_callback
             except Exception:
                 pass
@@ -719,6 +735,7 @@ class MainWindow(QMainWindow):
         self.validation_thread.progress.connect(self.on_progress_updated)
         self.validation_thread.log.connect(self.log_message)
         self.validation_thread.email_processed.connect(self.on_email_processed)
+        self.validation_thread.emails_processed.connect(self.on_emails_processed)
         self.validation_thread.email_processing_started.connect(self.on_email_processing_started)
         self.validation_thread.browser_ready.connect(self.on_browser_ready)
         self.validation_thread.summary.connect(self.on_validation_summary)
@@ -770,10 +787,10 @@ class MainWindow(QMainWindow):
             # Requeue any remaining emails from the processor back to the list so user can start again
             try:
                 proc = getattr(self.validation_thread, '_processor', None)
-                if proc and getattr(proc, 'email_queue', None):
+                if proc and hasattr(proc, 'drain_pending'):
                     try:
-                        # queue.Queue uses a deque internally at .queue
-                        remaining = list(proc.email_queue.queue)
+                        # Take back every email no worker has started; the processor won't hand them out anymore
+                        remaining = proc.drain_pending()
                         if remaining:
                             # Add back to the GUI list preserving order and avoiding duplicates
                             existing = {self.email_list.item(i).text().split('. ', 1)[1] if '. ' in self.email_list.item(i).text() else self.email_list.item(i).text() for i in range(self.email_list.count())}
@@ -784,19 +801,6 @@ class MainWindow(QMainWindow):
                                     item = QListWidgetItem(f"{i:02d}. {em}")
                                     item.setData(Qt.UserRole, em)
                                     self.email_list.addItem(item)
-                            # Clear the processor queue to prevent duplicates when restarting
-                            try:
-                                try:
-                                    proc.email_queue.queue.clear()
-                                except Exception:
-                                    # Fallback: drain using get_nowait
-                                    while not proc.email_queue.empty():
-                                        try:
-                                            proc.email_queue.get_nowait()
-                                        except Exception:
-                                            break
-                            except Exception:
-                                pass
                             self.log_message(f"🔁 Requeued {len(remaining)} emails into the list for restarting")
                     except Exception:
                         pass
@@ -902,19 +906,18 @@ class MainWindow(QMainWindow):
         try:
             proc = getattr(self.validation_thread, '_processor', None)
             pids = {}
-            if proc:
-                try:
-                    with proc._pid_lock:
-                        pids = dict(proc.browser_pids)
-                except Exception:
-                    pids = dict(proc.browser_pids) if hasattr(proc, 'browser_pids') else {}
+            if proc and hasattr(proc, 'browser_pids'):
+                # dict() copy is an atomic snapshot under the GIL; the registry has no lock
+                pids = dict(proc.browser_pids)
 
             for bid, pid in pids.items():
+                self.log_message(f"⚠️ Killing driver PID {pid} for browser {bid}...")
+            if pids:
                 try:
-                    self.log_message(f"⚠️ Killing driver PID {pid} for browser {bid}...")
-                    self._kill_pid_tree(pid)
+                    # One batched kill: every tree is terminated, then a single shared wait
+                    self._kill_pid_tree(*pids.values())
                 except Exception as e:
-                    self.log_message(f"⚠️ Could not kill PID {pid}: {e}")
+                    self.log_message(f"⚠️ Could not kill PIDs {list(pids.values())}: {e}")
 
             # Attempt to cleanup orphan drivers if method exists
             try:
@@ -924,22 +927,14 @@ class MainWindow(QMainWindow):
                 pass
             try:
                 # Clear tracked pids
-                if proc:
-                    with proc._pid_lock:
-                        proc.browser_pids.clear()
+                if proc and hasattr(proc, 'browser_pids'):
+                    proc.browser_pids.clear()
             except Exception:
                 pass
             try:
-                # Clear email queue safely so restart starts fresh with requeued items
-                if proc and getattr(proc, 'email_queue', None):
-                    try:
-                        proc.email_queue.queue.clear()
-                    except Exception:
-                        while not proc.email_queue.empty():
-                            try:
-                                proc.email_queue.get_nowait()
-                            except Exception:
-                                break
+                # Drop the processor's pending emails so restart starts fresh with requeued items
+                if proc and hasattr(proc, 'drain_pending'):
+                    proc.drain_pending()
             except Exception:
                 pass
         except Exception as e:
@@ -1031,6 +1026,11 @@ class MainWindow(QMainWindow):
             # Also log to main logger
             self.log_message(f"❌ INVALID - {email}")
 
+    def on_emails_processed(self, batch):
+        """Apply a batch of (email, is_valid, display) results from the validation thread."""
+        for email, is_valid, display in batch:
+            self.on_email_processed(email, is_valid, display)
+
     def on_email_processing_started(self, email, browser_id):
         """Handle when GUI worker starts processing an email - remove from the list in real-time
         and log which browser started the job."""
@@ -1116,41 +1116,34 @@ class MainWindow(QMainWindow):
         
         self.log_message("🧹 Cleanup complete")
 
-    def _kill_pid_tree(self, pid):
-        """Kill a process tree for given pid. Uses psutil if available, fallback to platform commands."""
-        try:
-            import psutil
+    def _kill_pid_tree(self, *pids):
+        """Kill the process trees of the given pids. Uses ap's psutil helper if available, fallback to platform commands."""
+        pids = [pid for pid in pids if pid]
+        if not pids:
+            return
+        # Force stop: ap._kill_process_tree in kill-only mode (timeout=0) kills every tree at once,
+        # no terminate() grace period and no waits
+        if AP_AVAILABLE and getattr(ap, 'PSUTIL_AVAILABLE', False):
             try:
-                p = psutil.Process(pid)
-                for c in p.children(recursive=True):
-                    try:
-                        c.kill()
-                    except Exception:
-                        pass
-                try:
-                    p.kill()
-                except Exception:
-                    pass
+                ap._kill_process_tree(*pids, timeout=0)
                 return
-            except psutil.NoSuchProcess:
-                return
-        except Exception:
-            pass
+            except Exception:
+                pass
 
         # fallback
         try:
             if sys.platform == 'win32':
-                subprocess.run(['taskkill', '/F', '/PID', str(pid), '/T'], check=False)
+                args = ['taskkill', '/F', '/T']
+                for pid in pids:
+                    args += ['/PID', str(pid)]
+                subprocess.run(args, check=False)
             else:
-                try:
-                    os.kill(pid, signal.SIGTERM)
-                    time.sleep(0.2)
-                except Exception:
-                    pass
-                try:
-                    os.kill(pid, signal.SIGKILL)
-                except Exception:
-                    pass
+                # Force stop: SIGKILL straight away instead of SIGTERM + sleep + SIGKILL
+                for pid in pids:
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except Exception:
+                        pass
         except Exception:
             pass
 
@@ -1477,7 +1470,7 @@ class MainWindow(QMainWindow):
     def load_initial_emails(self):
         try:
             with open('list.txt', 'r', encoding='utf-8') as f:
-                emails = [line.strip() for line in f if line.strip() and '@' in line.strip()]
+                emails = ap.unique_emails(f)
             self.set_email_list(emails)
             self.log_message(f"📧 Loaded {len(emails)} emails from list.txt")
         except FileNotFoundError:
@@ -1515,7 +1508,8 @@ class MainWindow(QMainWindow):
         if file_path:
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    emails = [line.strip() for line in f if line.strip() and '@' in line.strip()]
+                    # Same case-insensitive de-duplication as the processor, keeping file order
+                    emails = ap.unique_emails(f)
                 self.set_email_list(emails)
                 self.log_message(f"📧 Loaded {len(emails)} emails from {file_path}")
             except Exception as e: